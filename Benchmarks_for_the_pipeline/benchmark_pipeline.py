@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from io import BytesIO
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, here)
+sys.path.insert(0, os.path.join(here, '..', 'Scrapping_the_data_and_performing_calculations'))
+sys.path.insert(0, os.path.join(here, '..', 'UnitTest_for_the_scrapping'))
+from coingecko_client import make_session
+from correlation import correlation_matrix
+from fetcher import fetch_market_chart
+from rendering import render_coin_chart
+from scrapping_the_data_and_performing_calculations import clean_data, get_stats, plot_prices, plot_volume
+from synthetic_market_chart import PayloadSession, synthetic_universe
+
+# (total points, coins) cases run by default; the points are split evenly between the coins
+default_cases = [
+    (1_000, 1),
+    (100_000, 1),
+    (100_000, 10),
+    (100_000, 100),
+    (10_000_000, 1),
+    (10_000_000, 1000),
+]
+
+# Cases with more points than this are left out by --quick
+quick_max_points = 100_000
+
+results_dir = os.path.join(here, 'results')
+
+benchmarks = ('parse', 'clean', 'stats', 'correlation', 'plot', 'render')
+
+
+def case_label(points, coins):
+    return f'{points}x{coins}'
+
+
+def _transport(kind, payloads):
+    # The offline transport market_chart requests go through, and its base URL
+    if kind == 'mock':
+        return nullcontext((PayloadSession(payloads), 'http://benchmark.invalid/api/v3/'))
+    from stub_coingecko_server import StubCoinGeckoServer
+
+    routes = {f'/api/v3/coins/{coin}/market_chart': json.loads(body) for coin, body in payloads.items()}
+
+    class _StubTransport:
+        def __enter__(self):
+            self.server = StubCoinGeckoServer(routes).__enter__()
+            self.session = make_session()
+            return self.session, self.server.base_url
+
+        def __exit__(self, *exc):
+            self.session.close()
+            self.server.__exit__(*exc)
+
+    return _StubTransport()
+
+
+def _time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _plot_with_pyplot(df, volume_df, coin):
+    # The pyplot path main() takes, drawn into a buffer instead of a window
+    plt.figure()
+    plot_prices(df, coin)
+    plot_volume(volume_df, coin)
+    plt.savefig(BytesIO(), format='png')
+    plt.close()
+
+
+def run_case(points, coins, repeats=3, transport='mock', only=benchmarks):
+    """Time every pipeline step on `coins` synthetic coins of `points // coins` points each.
+
+    Returns one result entry per benchmark: the fastest and median wall
+    time over `repeats` runs, and the points processed per second. The
+    plot and render benchmarks draw the first coin only.
+    """
+    per_coin = max(points // coins, 1)
+    payloads = synthetic_universe(coins, per_coin)
+    names = list(payloads)
+    with _transport(transport, payloads) as (session, base_url):
+        histories = {coin: fetch_market_chart(session, coin, base_url) for coin in names}
+        steps = {
+            'parse': lambda: [fetch_market_chart(session, coin, base_url) for coin in names],
+        }
+        frames = {coin: clean_data(*histories[coin]) for coin in names}
+        first = names[0]
+        steps.update({
+            'clean': lambda: [clean_data(*histories[coin]) for coin in names],
+            'stats': lambda: [get_stats(frames[coin]) for coin in names],
+            'correlation': lambda: correlation_matrix(frames),
+            'plot': lambda: _plot_with_pyplot(frames[first], histories[first][1], first),
+            'render': lambda: render_coin_chart(first, histories[first][0], histories[first][1]),
+        })
+        results = []
+        for name in only:
+            if name == 'correlation' and coins < 2:
+                continue
+            timings = _time(steps[name], repeats)
+            drawn = per_coin if name in ('plot', 'render') else per_coin * coins
+            results.append({
+                'benchmark': name,
+                'case': case_label(points, coins),
+                'points': drawn,
+                'coins': 1 if name in ('plot', 'render') else coins,
+                'repeats': repeats,
+                'best_seconds': min(timings),
+                'median_seconds': statistics.median(timings),
+                'points_per_second': drawn / min(timings) if min(timings) else float('inf'),
+            })
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    # Benchmarks of `current` whose best time is more than `tolerance`
+    # (a fraction) slower than the same benchmark and case in `baseline`
+    before = {(entry['benchmark'], entry['case']): entry['best_seconds'] for entry in baseline['results']}
+    rows = []
+    for entry in current['results']:
+        old = before.get((entry['benchmark'], entry['case']))
+        if old:
+            rows.append({
+                'benchmark': entry['benchmark'],
+                'case': entry['case'],
+                'before': old,
+                'after': entry['best_seconds'],
+                'ratio': entry['best_seconds'] / old,
+                'regression': entry['best_seconds'] > old * (1 + tolerance),
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline on synthetic market_chart data, offline.')
+    parser.add_argument('--case', action='append', metavar='POINTSxCOINS', help='e.g. 100000x10; repeatable')
+    parser.add_argument('--quick', action='store_true', help=f'skip cases with more than {quick_max_points} points')
+    parser.add_argument('--only', nargs='+', choices=benchmarks, default=list(benchmarks))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--transport', choices=('mock', 'stub'), default='mock',
+                        help='mocked requests transport, or a local HTTP stub server')
+    parser.add_argument('--output', help='where to save the results (default: results/<timestamp>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file to compare against')
+    args = parser.parse_args(argv)
+
+    cases = [tuple(int(part) for part in case.split('x')) for case in args.case] if args.case else default_cases
+    if args.quick:
+        cases = [case for case in cases if case[0] <= quick_max_points]
+    report = {'started': time.time(), 'environment': environment(), 'results': []}
+    for points, coins in cases:
+        for entry in run_case(points, coins, args.repeats, args.transport, args.only):
+            report['results'].append(entry)
+            print(f"{entry['benchmark']:<12} {entry['case']:>14} {entry['best_seconds']:>10.4f}s "
+                  f"{entry['points_per_second']:>14,.0f} points/s")
+
+    output = args.output or os.path.join(results_dir, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Saved results to {output}.')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for row in compare_results(baseline, report):
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(f"{row['benchmark']:<12} {row['case']:>14} {row['before']:>10.4f}s -> {row['after']:.4f}s "
+                  f"({row['ratio']:.2f}x){flag}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import requests
+
+# Synthetic series start on 2022-03-13 and span a year, whatever their length
+start_ms = 1647129600000
+span_ms = 365 * 24 * 3600 * 1000
+
+
+def synthetic_series(n_points, seed=0, base_price=100.0, span_ms=span_ms):
+    """Timestamps, prices, market caps and volumes of one synthetic coin.
+
+    Prices follow a geometric random walk and volumes are lognormal, with
+    the points evenly spaced over `span_ms` so that clean_data always has
+    the same number of days to resample to. The same seed always gives
+    the same series.
+    """
+    rng = np.random.default_rng(seed)
+    step_ms = max(span_ms // max(n_points, 1), 1)
+    timestamps = start_ms + np.arange(n_points, dtype=np.int64) * step_ms
+    prices = base_price * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_points)))
+    market_caps = prices * 1e7
+    volumes = rng.lognormal(20.0, 0.5, n_points)
+    return timestamps, prices, market_caps, volumes
+
+
+def synthetic_market_chart(n_points, seed=0, base_price=100.0):
+    # The decoded body of a market_chart response: [timestamp_ms, value] pairs
+    timestamps, prices, market_caps, volumes = synthetic_series(n_points, seed, base_price)
+    ts = timestamps.astype(float)
+    return {
+        'prices': np.column_stack([ts, prices]).tolist(),
+        'market_caps': np.column_stack([ts, market_caps]).tolist(),
+        'total_volumes': np.column_stack([ts, volumes]).tolist(),
+    }
+
+
+def synthetic_universe(coins, points_per_coin, seed=0):
+    # Encoded market_chart bodies of `coins` coins named coin-0, coin-1, ...
+    return {
+        f'coin-{i}': json.dumps(synthetic_market_chart(points_per_coin, seed + i, 100.0 * (i + 1))).encode('utf-8')
+        for i in range(coins)
+    }
+
+
+class PayloadSession:
+    """Offline stand-in for a requests.Session.
+
+    `get` answers coins/<id>/market_chart URLs with the pre-encoded body of
+    that coin from `payloads`, wrapped in a real `requests.Response`, so
+    the code under test decodes and parses it exactly as it would a
+    network response. Unknown coins get a 404.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.requests = 0
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        coin = url.rstrip('/').split('/')[-2]
+        response = requests.Response()
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        if coin in self.payloads:
+            response.status_code = 200
+            response._content = self.payloads[coin]
+        else:
+            response.status_code = 404
+            response._content = b'{"error": "not found"}'
+        return response
+
+    def close(self):
+        pass
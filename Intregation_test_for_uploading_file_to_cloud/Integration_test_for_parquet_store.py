@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+from io import BytesIO, StringIO
+
+import boto3
+import numpy as np
+import pandas as pd
+from moto import mock_aws
+from pandas.testing import assert_frame_equal
+
+for folder in ("Scrapping_the_data_and_performing_calculations", "Scrapping_the_data_and uploading_to_s3"):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", folder))
+from parquet_store import (
+    frame_from_parquet_buffer,
+    frame_to_parquet_buffer,
+    read_coin,
+    read_parquet,
+    write_parquet,
+)
+from s3_uploader import S3Uploader
+
+
+def make_frame(n_days=90, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.to_datetime(1672531200000 + np.arange(n_days) * 86400000, unit="ms")
+    return pd.DataFrame(
+        {"timestamp": timestamps, "price": rng.normal(100, 5, n_days), "volume": rng.uniform(1e9, 2e9, n_days)}
+    )
+
+
+class TestParquetStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, "cleaned")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_preserves_types(self):
+        frames = {"bitcoin": make_frame(seed=1), "ethereum": make_frame(seed=2)}
+        write_parquet(frames, self.root)
+        for coin, df in frames.items():
+            assert_frame_equal(read_coin(self.root, coin), df)
+        self.assertEqual(sorted(os.listdir(self.root)), ["coin=bitcoin", "coin=ethereum"])
+
+    def test_reads_only_requested_columns_and_dates(self):
+        df = make_frame()
+        write_parquet({"bitcoin": df, "ethereum": make_frame(seed=3)}, self.root)
+        result = read_coin(self.root, "bitcoin", columns=["price"], start="2023-02-10", end="2023-02-20")
+        expected = df[(df["timestamp"] >= "2023-02-10") & (df["timestamp"] <= "2023-02-20")]
+        assert_frame_equal(result, expected[["timestamp", "price"]].reset_index(drop=True))
+
+    def test_read_parquet_reads_several_coins_at_once(self):
+        frames = {coin: make_frame(seed=i) for i, coin in enumerate(("bitcoin", "ethereum", "solana"))}
+        write_parquet(frames, self.root)
+        result = read_parquet(self.root, coins=["solana", "bitcoin"], columns=["price"])
+        self.assertEqual(list(result.columns), ["coin", "timestamp", "price"])
+        self.assertEqual(sorted(result["coin"].astype(str).unique()), ["bitcoin", "solana"])
+        for coin in ("bitcoin", "solana"):
+            rows = result[result["coin"].astype(str) == coin]
+            np.testing.assert_array_equal(rows["price"].to_numpy(), frames[coin]["price"].to_numpy())
+
+    def test_rewriting_replaces_only_the_written_partitions(self):
+        df = make_frame()
+        write_parquet({"bitcoin": df}, self.root)
+        updated = df.iloc[:31].assign(price=0.0)
+        write_parquet({"bitcoin": updated}, self.root)
+        result = read_coin(self.root, "bitcoin")
+        assert_frame_equal(result, pd.concat([updated, df.iloc[31:]], ignore_index=True))
+
+    def test_parquet_is_smaller_than_csv(self):
+        df = make_frame(n_days=5000)
+        csv_buffer = StringIO()
+        df.to_csv(csv_buffer, index=False)
+        self.assertLess(len(frame_to_parquet_buffer(df).getvalue()), len(csv_buffer.getvalue()))
+
+    @mock_aws
+    def test_s3_round_trip_preserves_types(self):
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-bucket")
+        df = make_frame()
+        S3Uploader("test-bucket", client=client).upload_buffer("data.parquet", frame_to_parquet_buffer(df))
+        body = client.get_object(Bucket="test-bucket", Key="data.parquet")["Body"].read()
+        assert_frame_equal(frame_from_parquet_buffer(BytesIO(body)), df)
+
+
+if __name__ == "__main__":
+    unittest.main()
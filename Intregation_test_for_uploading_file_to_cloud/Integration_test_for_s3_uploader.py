@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+from datetime import date
+from io import BytesIO, StringIO
+
+import boto3
+from moto import mock_aws
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and uploading_to_s3",
+    ),
+)
+from s3_uploader import S3Uploader, object_key
+
+BUCKET = "test-bucket"
+
+
+@mock_aws
+class TestS3Uploader(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.client = boto3.client("s3", region_name="us-east-1")
+        self.client.create_bucket(Bucket=BUCKET)
+
+    def read(self, key):
+        return self.client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+    def test_keys_are_per_coin_and_per_day(self):
+        key = object_key("bitcoin", "plot", "png", date=date(2023, 3, 14))
+        self.assertEqual(key, "crypto/bitcoin/2023-03-14/plot.png")
+
+    def test_uploads_buffers_in_parallel_without_overwriting(self):
+        uploader = S3Uploader(BUCKET, client=self.client, max_workers=4)
+        uploads = [
+            (object_key(coin, "plot", "png"), BytesIO(coin.encode() * 100), "image/png")
+            for coin in ("bitcoin", "ethereum", "solana")
+        ]
+        uploads.append(("notes.txt", StringIO("hello"), None))
+        keys = uploader.upload_many(uploads)
+        self.assertEqual(keys, [upload[0] for upload in uploads])
+        for coin in ("bitcoin", "ethereum", "solana"):
+            self.assertEqual(self.read(object_key(coin, "plot", "png")), coin.encode() * 100)
+        self.assertEqual(self.read("notes.txt"), b"hello")
+        head = self.client.head_object(Bucket=BUCKET, Key=keys[0])
+        self.assertEqual(head["ContentType"], "image/png")
+
+    def test_large_objects_use_multipart_upload(self):
+        threshold = 5 * 1024 * 1024
+        uploader = S3Uploader(BUCKET, client=self.client, multipart_threshold=threshold)
+        payload = os.urandom(2 * threshold + 123)
+        uploader.upload_buffer("big.bin", payload)
+        self.assertEqual(self.read("big.bin"), payload)
+        # Multipart ETags end in "-<number of parts>"
+        etag = self.client.head_object(Bucket=BUCKET, Key="big.bin")["ETag"]
+        self.assertTrue(etag.strip('"').endswith("-3"))
+
+if __name__ == "__main__":
+    unittest.main()
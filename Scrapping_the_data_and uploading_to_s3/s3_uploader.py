@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from io import BytesIO, StringIO
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# Number of objects uploaded at the same time
+max_workers = 8
+
+# Objects larger than this are sent as a multipart upload in parts of this size
+multipart_threshold = 8 * 1024 * 1024
+
+
+def make_s3_client(endpoint_url=None, pool_size=max_workers):
+    # endpoint_url points the client at a local S3 stand-in (MinIO, moto server...)
+    return boto3.client(
+        "s3", endpoint_url=endpoint_url, config=Config(max_pool_connections=pool_size)
+    )
+
+
+def object_key(coin, kind, extension, date=None, prefix="crypto"):
+    date = date or datetime.now(timezone.utc).date()
+    return f"{prefix}/{coin}/{date:%Y-%m-%d}/{kind}.{extension}"
+
+
+class S3Uploader:
+    """Uploads in-memory buffers to one bucket through a single pooled client.
+
+    Buffers are streamed with `upload_fileobj`, which switches to a
+    multipart upload for objects above `multipart_threshold`, and
+    `upload_many` sends up to `max_workers` objects in parallel.
+    """
+
+    def __init__(self, bucket_name, client=None, max_workers=max_workers, multipart_threshold=multipart_threshold):
+        self.bucket_name = bucket_name
+        self.max_workers = max_workers
+        self.client = client or make_s3_client(pool_size=max_workers)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_threshold,
+            max_concurrency=max_workers,
+        )
+
+    def upload_buffer(self, key, buffer, content_type=None):
+        if isinstance(buffer, (bytes, bytearray)):
+            buffer = BytesIO(buffer)
+        elif isinstance(buffer, StringIO):
+            buffer = BytesIO(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_fileobj(
+            buffer, self.bucket_name, key, ExtraArgs=extra_args, Config=self.transfer_config
+        )
+        return key
+
+    def upload_many(self, uploads):
+        # uploads is an iterable of (key, buffer, content_type) tuples
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda upload: self.upload_buffer(*upload), uploads))
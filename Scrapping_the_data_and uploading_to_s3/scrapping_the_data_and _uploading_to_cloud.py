@@ -1,88 +1,110 @@
 import pandas as pd
 import requests
-import statistics
-import boto3
 import os
-import matplotlib.pyplot as plt
-from io import StringIO, BytesIO
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# The shared fetching helpers live next to the calculations script
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from fetcher import get_historical_data_batch
+from ingest import align_points, parse_market_chart_body, split_frame
+from market_cache import MarketChartCache
+from streaming_stats import StatsAccumulator
+from parquet_store import frame_to_parquet_buffer
+from profiler import add_bytes, profiler, stage
+from rendering import render_charts
+from s3_uploader import S3Uploader, object_key
 
 # Define the base URL for the CoinGecko API
 base_url = "https://api.coingecko.com/api/v3/"
 
-# Define the S3 bucket name and file name
+# Define the S3 bucket name; objects are stored per coin and per day under it
 bucket_name = "my-bucket-name"
-file_name = "crypto_data.csv"
 
 
 def get_historical_data(coin):
     url = f"{base_url}coins/{coin}/market_chart?vs_currency=usd&days=30"
-    response = requests.get(url)
+    response = requests.get(url, timeout=30)
     if response.status_code != 200:
         print(
             f"Error: Could not retrieve data for {coin}. Status code: {response.status_code}."
         )
         return pd.DataFrame(), pd.DataFrame()
-    data = response.json()
-    prices_df = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
-    prices_df["timestamp"] = pd.to_datetime(prices_df["timestamp"], unit="ms")
-    volume_df = pd.DataFrame(data["total_volumes"], columns=["timestamp", "volume"])
-    volume_df["timestamp"] = pd.to_datetime(volume_df["timestamp"], unit="ms")
-    return prices_df, volume_df
+    return split_frame(parse_market_chart_body(response.content))
 
 
-def clean_data(prices_df, volume_df):
-    df = pd.merge(prices_df, volume_df, on="timestamp")
+def clean_data(prices_df, volume_df=None):
+    # Without volume_df, prices_df is already an aligned frame (e.g. with market caps)
+    df = prices_df if volume_df is None else align_points(prices_df, volume_df)
     df = df.set_index("timestamp").resample("D").mean().reset_index()
     return df
 
 
 def get_stats(df):
-    stats = {}
-    q1 = df["price"].quantile(0.25)
-    q3 = df["price"].quantile(0.75)
-    iqr = q3 - q1
-    lower_bound = q1 - 1.5 * iqr
-    upper_bound = q3 + 1.5 * iqr
-    outliers = df[(df["price"] < lower_bound) | (df["price"] > upper_bound)]
-    stats["outliers"] = outliers
-    stats["avg_price"] = df["price"].mean()
-    stats["std_dev_price"] = statistics.stdev(df["price"])
-    stats["min_price"] = df["price"].min()
-    stats["max_price"] = df["price"].max()
-    stats["avg_volume"] = df["volume"].mean()
-    stats["std_dev_volume"] = statistics.stdev(df["volume"])
-    stats["min_volume"] = df["volume"].min()
-    stats["max_volume"] = df["volume"].max()
+    # One accumulation pass per column; the IQR bounds come from its quantiles
+    accumulator = StatsAccumulator().update(df)
+    stats = accumulator.summary()
+    lower_bound, upper_bound = accumulator.outlier_bounds("price")
+    stats["outliers"] = df[(df["price"] < lower_bound) | (df["price"] > upper_bound)]
     return stats
 
 
 def plot_prices(df, coin):
+    # pyplot is only imported when something is plotted
+    import matplotlib.pyplot as plt
+
     plt.plot(df["timestamp"], df["price"], label=coin.capitalize())
 
 
 def plot_volume(volume_df, coin):
+    import matplotlib.pyplot as plt
+
     plt.plot(
         volume_df["timestamp"], volume_df["volume"], label=f"{coin.capitalize()} Volume"
     )
 
-def upload_to_s3(bucket_name, file_name):
-    s3 = boto3.client("s3")
-    full_path = os.path.join(os.getcwd(), file_name) # or any other desired full path
-    s3.upload_file(full_path, bucket_name, file_name)
+def _buffer_size(buffer):
+    return len(buffer) if isinstance(buffer, (bytes, bytearray)) else len(buffer.getbuffer())
+
+
+def upload_to_s3(bucket_name, uploads):
+    # uploads is a list of (coin, key, buffer, content_type) tuples sent in
+    # parallel; each is timed, with its size, as an upload stage of its coin
+    uploader = S3Uploader(bucket_name)
 
+    def upload(coin, key, buffer, content_type):
+        with stage("upload", coin):
+            add_bytes(_buffer_size(buffer))
+            return uploader.upload_buffer(key, buffer, content_type)
 
-def main():
-    coins = ["bitcoin", "ethereum"]
+    with ThreadPoolExecutor(max_workers=uploader.max_workers) as executor:
+        return list(executor.map(lambda item: upload(*item), uploads))
+
+
+def main(coins=("bitcoin", "ethereum"), bucket_name=bucket_name, days=30, base_url=base_url):
+    cache = MarketChartCache()
+    histories = get_historical_data_batch(coins, base_url=base_url, days=days, cache=cache)
+    uploads = []
+    charts = {}
     for coin in coins:
-        prices_df, volume_df = get_historical_data(coin)
-        if prices_df is None or volume_df is None:
+        prices_df, volume_df = histories[coin]
+        if prices_df.empty or volume_df.empty:
             continue
-        df = clean_data(prices_df, volume_df)
+        with stage("clean", coin):
+            df = clean_data(prices_df, volume_df)
         if df.empty:
             print(f"Error: Data is empty for {coin}.")
             continue
-        stats = get_stats(df)
-        print(f"Stats for {coin.capitalize()} (past 30 days):\n")
+        with stage("stats", coin):
+            stats = get_stats(df)
+        print(f"Stats for {coin.capitalize()} (past {days} days):\n")
         print(f"Number of data points: {len(df)}\n")
         print(f"Average Price: {stats['avg_price']}\n")
         print(f"Standard Deviation of Price: {stats['std_dev_price']}\n")
@@ -92,23 +114,25 @@ def main():
         print(f"Standard Deviation of Volume: {stats['std_dev_volume']}\n")
         print(f"Minimum Volume: {stats['min_volume']}\n")
         print(f"Maximum Volume: {stats['max_volume']}\n")
-        # Plot the price and volume data
-        plot_prices(df, coin)
-        plot_volume(volume_df, coin)
-        # Add legend and labels to the plot
-        plt.legend()
-        plt.title("Cryptocurrency Price and Volume")
-        plt.xlabel("Date")
-        plt.ylabel("Price / Volume (USD)")
-        # Save the plot to a BytesIO buffer
-        buf = BytesIO()
-        plt.savefig(buf, format="png")
-        # Upload the plot to S3
-        buf.seek(0)
-        upload_to_s3(bucket_name, file_name)
-        s3 = boto3.resource("s3")
-        s3.Object(bucket_name, file_name).put(Body=buf.getvalue())
-        print(f"Plot saved to {bucket_name}/{file_name}.")
+        charts[coin] = (df, volume_df)
+        uploads.append(
+            (
+                coin,
+                object_key(coin, "data", "parquet"),
+                frame_to_parquet_buffer(df),
+                "application/vnd.apache.parquet",
+            )
+        )
+    # Render the price and volume plots headlessly, in parallel (timed per coin)
+    pngs = render_charts(charts)
+    for coin, png in pngs.items():
+        uploads.append((coin, object_key(coin, "plot", "png"), png, "image/png"))
+    # Upload every coin's data and plot to S3
+    for key in upload_to_s3(bucket_name, uploads):
+        print(f"Saved to {bucket_name}/{key}.")
+    cache.close()
+    if profiler.enabled:
+        print(profiler.to_json())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+from coingecko_client import CoinGeckoClient, max_concurrency
+from fetcher import base_url
+
+# market_chart/range returns hourly points for ranges of up to 90 days
+# (and 5-minute points for ranges of up to one day)
+chunk_days = 90
+
+# Payload keys kept for each chunk
+series_keys = ('prices', 'market_caps', 'total_volumes')
+
+
+def plan_chunks(start, end, chunk_days=chunk_days):
+    # Split [start, end] into consecutive (from, to) windows in epoch seconds
+    start_s = int(pd.Timestamp(start).timestamp())
+    end_s = int(pd.Timestamp(end).timestamp())
+    step = chunk_days * 24 * 3600
+    return [(lo, min(lo + step, end_s)) for lo in range(start_s, end_s, step)]
+
+
+def _chunk_path(checkpoint_dir, coin, chunk):
+    return os.path.join(checkpoint_dir, coin, f'{chunk[0]}_{chunk[1]}.npz')
+
+
+def _fetch_chunk(client, base_url, coin, chunk, checkpoint_dir, vs_currency):
+    url = f'{base_url}coins/{coin}/market_chart/range'
+    params = {'vs_currency': vs_currency, 'from': chunk[0], 'to': chunk[1]}
+    try:
+        response = client.get(url, params=params)
+    except requests.RequestException as exc:
+        print(f'Error: Could not retrieve {coin} from {chunk[0]} to {chunk[1]}. {exc}')
+        return False
+    if response.status_code != 200:
+        print(f'Error: Could not retrieve {coin} from {chunk[0]} to {chunk[1]}. Status code: {response.status_code}.')
+        return False
+    data = response.json()
+    arrays = {key: np.asarray(data.get(key, []), dtype=float).reshape(-1, 2) for key in series_keys}
+    path = _chunk_path(checkpoint_dir, coin, chunk)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename, so an interrupted run never leaves a half-written checkpoint
+    tmp_path = f'{path}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return True
+
+
+def stitch_chunks(paths, key='prices'):
+    # One time-sorted series without duplicate timestamps; on overlaps the
+    # point from the later chunk wins
+    parts = []
+    for path in paths:
+        with np.load(path) as chunk:
+            parts.append(chunk[key])
+    points = np.concatenate(parts) if parts else np.empty((0, 2))
+    points = points[np.argsort(points[:, 0], kind='stable')]
+    keep = np.r_[points[1:, 0] != points[:-1, 0], True]
+    return points[keep]
+
+
+def load_backfill(coin, chunks, checkpoint_dir):
+    paths = [_chunk_path(checkpoint_dir, coin, chunk) for chunk in chunks]
+    prices = stitch_chunks(paths, 'prices')
+    volumes = stitch_chunks(paths, 'total_volumes')
+    prices_df = pd.DataFrame({'timestamp': pd.to_datetime(prices[:, 0].astype(np.int64), unit='ms'), 'price': prices[:, 1]})
+    volume_df = pd.DataFrame({'timestamp': pd.to_datetime(volumes[:, 0].astype(np.int64), unit='ms'), 'volume': volumes[:, 1]})
+    return prices_df, volume_df
+
+
+def backfill(coins, start, end, client=None, base_url=base_url, chunk_days=chunk_days,
+             checkpoint_dir='backfill_checkpoints', max_workers=max_concurrency, vs_currency='usd'):
+    """Download a long date range for many coins in resumable chunks.
+
+    The range is split into `chunk_days`-long market_chart/range windows,
+    which are fetched concurrently. Each finished chunk is saved under
+    `checkpoint_dir`; chunks already there are skipped, so rerunning an
+    interrupted backfill only fetches what is missing. Returns a dict
+    mapping each coin whose chunks are all present to its stitched
+    `(prices_df, volume_df)` pair. Downloaded chunks go straight to disk
+    and are only read back when their coin is stitched.
+    """
+    chunks = plan_chunks(start, end, chunk_days)
+    pending = [
+        (coin, chunk)
+        for coin in coins
+        for chunk in chunks
+        if not os.path.exists(_chunk_path(checkpoint_dir, coin, chunk))
+    ]
+    own_client = client is None
+    if own_client:
+        client = CoinGeckoClient(pool_size=max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            done = list(executor.map(
+                lambda job: _fetch_chunk(client, base_url, job[0], job[1], checkpoint_dir, vs_currency), pending
+            ))
+    finally:
+        if own_client:
+            client.close()
+    incomplete = {coin for (coin, _), ok in zip(pending, done) if not ok}
+    for coin in incomplete:
+        print(f'Backfill of {coin} is incomplete; run it again to resume.')
+    return {coin: load_backfill(coin, chunks, checkpoint_dir) for coin in coins if coin not in incomplete}
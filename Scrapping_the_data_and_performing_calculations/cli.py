@@ -0,0 +1,154 @@
+"""Command-line entry point for the pipeline.
+
+    python cli.py price bitcoin ethereum
+    python cli.py fetch bitcoin ethereum --days 90
+    python cli.py stats bitcoin ethereum
+    python cli.py correlate bitcoin ethereum solana --on log_returns
+    python cli.py plot bitcoin ethereum --output charts
+    python cli.py upload bitcoin ethereum --bucket my-bucket-name
+
+Only the standard library is imported up front. Each subcommand imports
+what it needs when it runs, so `price` never loads pandas and nothing
+but `upload` loads boto3. Add --import-time to see how long the
+subcommand spent importing.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+upload_dir = os.path.join(here, '..', 'Scrapping_the_data_and uploading_to_s3')
+
+# Seconds spent in _load, reported by --import-time
+import_seconds = {}
+
+
+def _load(*names):
+    # Import modules by name, timing the ones not loaded yet
+    modules = []
+    for name in names:
+        started = time.perf_counter()
+        modules.append(importlib.import_module(name))
+        import_seconds.setdefault(name, time.perf_counter() - started)
+    return modules[0] if len(modules) == 1 else modules
+
+
+def _histories(args):
+    fetcher, market_cache = _load('fetcher', 'market_cache')
+    cache = market_cache.MarketChartCache()
+    try:
+        return fetcher.get_historical_data_batch(args.coins, base_url=args.base_url or fetcher.base_url, days=args.days, cache=cache)
+    finally:
+        cache.close()
+
+
+def _frames(args):
+    # Each coin's clean_data frame, cleaned on every core
+    parallel_analytics = _load('parallel_analytics')
+    return parallel_analytics.analyze_coins(_histories(args))
+
+
+def price(args):
+    coingecko_client, live_poller = _load('coingecko_client', 'live_poller')
+    client = coingecko_client.CoinGeckoClient()
+    try:
+        prices = live_poller.fetch_simple_prices(client, args.coins, args.vs_currency, args.base_url or coingecko_client.base_url)
+    finally:
+        client.close()
+    for coin in args.coins:
+        if coin in prices:
+            print(f'{coin}: {prices[coin]:,.2f} {args.vs_currency.upper()}')
+        else:
+            print(f'Error: Could not retrieve current price for {coin}.')
+
+
+def fetch(args):
+    for coin, (prices_df, volume_df) in _histories(args).items():
+        if prices_df.empty:
+            print(f'Error: Could not retrieve data for {coin}.')
+        else:
+            print(f"{coin}: {len(prices_df)} points up to {prices_df['timestamp'].iloc[-1]}")
+
+
+def stats(args):
+    summary, _ = _frames(args)
+    print(summary.to_string())
+
+
+def correlate(args):
+    correlation = _load('correlation')
+    _, frames = _frames(args)
+    print(correlation.correlation_matrix(frames, method=args.method, on=args.on).round(4).to_string())
+
+
+def plot(args):
+    rendering = _load('rendering')
+    histories = _histories(args)
+    _, frames = _load('parallel_analytics').analyze_coins(histories)
+    charts = {coin: (df, histories[coin][1]) for coin, df in frames.items()}
+    os.makedirs(args.output, exist_ok=True)
+    for coin, image in rendering.render_charts(charts, fmt=args.format).items():
+        path = os.path.join(args.output, f'{coin}.{args.format}')
+        with open(path, 'wb') as f:
+            f.write(image)
+        print(f'Saved {path}.')
+
+
+def upload(args):
+    if upload_dir not in sys.path:
+        sys.path.insert(0, upload_dir)
+    script = _load('scrapping_the_data_and _uploading_to_cloud')
+    script.main(args.coins, args.bucket or script.bucket_name, args.days, args.base_url or script.base_url)
+
+
+commands = {'price': price, 'fetch': fetch, 'stats': stats, 'correlate': correlate, 'plot': plot, 'upload': upload}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Fetch, analyse, plot and upload cryptocurrency market data.')
+    parser.add_argument('--import-time', action='store_true', help='print the time spent importing modules')
+    parser.add_argument('--base-url', help='CoinGecko API root, e.g. a mirror (default: the public API)')
+    parser.add_argument('--profile', action='store_true', help='print per-stage timings (or set CRYPTO_PIPELINE_PROFILE=1)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add(name, help, history=True):
+        subparser = subparsers.add_parser(name, help=help)
+        subparser.add_argument('coins', nargs='+', help='CoinGecko coin ids, e.g. bitcoin ethereum')
+        if history:
+            subparser.add_argument('--days', type=int, default=30, help='days of history (default: 30)')
+        return subparser
+
+    add('price', 'current prices in one request', history=False).add_argument('--vs-currency', default='usd')
+    add('fetch', 'download market charts into the local cache')
+    add('stats', 'daily stats of each coin')
+    correlate_parser = add('correlate', 'correlation matrix of the coins')
+    correlate_parser.add_argument('--method', choices=('pearson', 'spearman'), default='pearson')
+    correlate_parser.add_argument('--on', choices=('price', 'log_returns'), default='price')
+    plot_parser = add('plot', 'render a price and volume chart per coin')
+    plot_parser.add_argument('--output', default='charts', help='directory for the images (default: charts)')
+    plot_parser.add_argument('--format', default='png')
+    add('upload', 'fetch, clean and upload data and charts to S3').add_argument('--bucket')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        _load('profiler').profiler.enable()
+    started = time.perf_counter()
+    commands[args.command](args)
+    if args.profile:
+        print(_load('profiler').profiler.to_json())
+    if args.import_time:
+        total = sum(import_seconds.values())
+        print(f'{args.command}: {total * 1000:.0f} ms importing, {(time.perf_counter() - started) * 1000:.0f} ms in total',
+              file=sys.stderr)
+        for name, seconds in sorted(import_seconds.items(), key=lambda item: -item[1]):
+            print(f'  {name}: {seconds * 1000:.0f} ms', file=sys.stderr)
+    return args
+
+
+if __name__ == '__main__':
+    main()
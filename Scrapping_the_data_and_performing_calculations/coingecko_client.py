@@ -0,0 +1,143 @@
+import random
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Define the base URL for the CoinGecko API
+base_url = 'https://api.coingecko.com/api/v3/'
+
+# Maximum number of requests in flight at the same time
+max_concurrency = 8
+
+# The public API allows roughly 30 calls per minute
+calls_per_minute = 30
+
+# Responses worth retrying: rate limiting and transient server errors
+retry_statuses = {429, 500, 502, 503, 504}
+
+
+def make_session(pool_size=max_concurrency):
+    # One pooled session shared by every worker thread, sized so that no
+    # worker has to wait for (or open) an extra connection.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second on average
+    and bursts of up to `capacity` calls."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        # Hold every caller back, e.g. while the server asks us to via Retry-After
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CoinGeckoClient:
+    """Rate-limited CoinGecko client that can stand in for a requests.Session.
+
+    Every request waits for a token from a shared bucket, gets `timeout`
+    applied, and is retried on connection errors, timeouts, 429 and 5xx
+    responses with jittered exponential backoff (or as long as Retry-After
+    says). Identical requests made while one is already in flight wait for
+    and share its response instead of being sent again.
+    """
+
+    def __init__(self, calls_per_minute=calls_per_minute, burst=5, max_retries=5, backoff=1.0, max_backoff=60.0,
+                 timeout=(3.05, 30), session=None, pool_size=max_concurrency):
+        self.bucket = TokenBucket(calls_per_minute / 60, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = session or make_session(pool_size)
+        self.retries = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def get(self, url, params=None):
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            response = self._get_with_retries(url, params)
+            future.set_result(response)
+            return response
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _get_with_retries(self, url, params):
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                delay = None
+            else:
+                if response.status_code not in retry_statuses or attempt == self.max_retries:
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is not None:
+                    self.bucket.pause(delay)
+            with self._lock:
+                self.retries += 1
+            if delay is None:
+                # Full jitter keeps the retries of many workers from lining up
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            time.sleep(delay)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from rolling import column_centres
+
+
+def align_frames(frames, column='price'):
+    # One column per coin, one row per timestamp; a coin missing a
+    # timestamp gets NaN there instead of shifting its other values.
+    wide = pd.concat({coin: df.set_index('timestamp')[column] for coin, df in frames.items()}, axis=1)
+    return wide.sort_index()
+
+
+def to_log_returns(wide):
+    return np.log(wide).diff().iloc[1:]
+
+
+def _pairwise_pearson(values):
+    # Pearson correlation over the rows where both coins of a pair have a
+    # value (the same rule DataFrame.corr uses), done as a handful of matrix
+    # products instead of a loop over the pairs.
+    valid = ~np.isnan(values)
+    mask = valid.astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = np.where(valid, values - column_centres(values), 0.0)
+        n = mask.T @ mask
+        sum_x = x.T @ mask
+        sum_xx = (x * x).T @ mask
+        sum_xy = x.T @ x
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x ** 2 / n
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(frames, method='pearson', on='price'):
+    """Correlation of every pair of coins, aligned on the clean_data timestamps.
+
+    `frames` maps each coin to its clean_data output. `on` is 'price' or
+    'log_returns' and `method` is 'pearson' or 'spearman'. Spearman ranks
+    each coin over all of its own values, so it only matches a per-pair
+    ranking when the coins share the same timestamps.
+    """
+    wide = align_frames(frames)
+    if on == 'log_returns':
+        wide = to_log_returns(wide)
+    elif on != 'price':
+        raise ValueError(f"Unknown series '{on}', expected 'price' or 'log_returns'.")
+    if method == 'spearman':
+        wide = wide.rank()
+    elif method != 'pearson':
+        raise ValueError(f"Unknown method '{method}', expected 'pearson' or 'spearman'.")
+    corr = _pairwise_pearson(wide.to_numpy(dtype=float))
+    return pd.DataFrame(corr, index=wide.columns, columns=wide.columns)
+
+
+def rolling_correlation(frames, reference, window, on='log_returns'):
+    # Rolling Pearson correlation of every coin against `reference`
+    wide = align_frames(frames)
+    if on == 'log_returns':
+        wide = to_log_returns(wide)
+    return wide.rolling(window).corr(wide[reference])
@@ -0,0 +1,109 @@
+"""Market charts of many coins in many currencies from one fetch per coin.
+
+CoinGecko quotes a market chart in a single vs_currency, so N coins in K
+currencies used to cost N * K requests. Here every coin is fetched once in
+USD, and each other currency is derived locally from a reference series:
+bitcoin's chart in that currency divided by its chart in USD gives the
+USD -> currency rate at every timestamp. That is one extra request per
+currency (none at all with a fresh MarketChartCache), and none for 'btc',
+whose rate is just one over bitcoin's USD price. Price, volume and market
+cap are all scaled by the rate, interpolated onto each coin's timestamps.
+A currency whose reference cannot be fetched falls back to fetching every
+coin in it directly.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from coingecko_client import CoinGeckoClient, base_url, max_concurrency
+from fetcher import fetch_market_chart_frame, get_market_frames_batch
+
+base_currency = 'usd'
+reference_coin = 'bitcoin'
+value_columns = ('price', 'volume', 'market_cap')
+
+
+def _milliseconds(df):
+    return df['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+
+
+def conversion_rates(base_frame, quote_frame=None):
+    """(timestamps in ms, rates) converting base_frame's currency into
+    quote_frame's, from one coin's chart in both. Without quote_frame the
+    rates convert into that coin itself (one over its price)."""
+    timestamps = _milliseconds(base_frame)
+    base = base_frame['price'].to_numpy(dtype=float)
+    if quote_frame is None:
+        quote = np.ones_like(base)
+    else:
+        # Both charts normally share timestamps; match them up when they do not
+        common, base_rows, quote_rows = np.intersect1d(timestamps, _milliseconds(quote_frame), return_indices=True)
+        timestamps, base = common, base[base_rows]
+        quote = quote_frame['price'].to_numpy(dtype=float)[quote_rows]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = quote / base
+    valid = np.isfinite(rates)
+    return timestamps[valid], rates[valid]
+
+
+def convert(df, timestamps, rates):
+    # A copy of df with its values in the quote currency of the rates
+    out = df.copy()
+    factor = np.interp(_milliseconds(df), timestamps, rates)
+    for column in value_columns:
+        if column in out:
+            out[column] = out[column].to_numpy(dtype=float) * factor
+    return out
+
+
+def get_multi_currency_frames(coins, currencies=(base_currency,), max_workers=max_concurrency, session=None,
+                              base_url=base_url, days=30, cache=None):
+    """Aligned price/volume/market_cap frames of every coin in every currency.
+
+    Returns {currency: {coin: frame}}. Coins are fetched once in USD
+    through get_market_frames_batch; other currencies are converted from
+    them as described in the module docstring. Coins that could not be
+    fetched map to an empty DataFrame in every currency.
+    """
+    coins = list(dict.fromkeys(coins))
+    currencies = [currency.lower() for currency in dict.fromkeys(currencies)]
+    derived = [currency for currency in currencies if currency != base_currency]
+    own_session = session is None
+    if own_session:
+        session = CoinGeckoClient(pool_size=max_workers)
+    try:
+        wanted = coins + [reference_coin] if derived and reference_coin not in coins else coins
+        frames = get_market_frames_batch(wanted, max_workers, session, base_url, days, cache)
+        reference = frames[reference_coin] if derived else None
+        quoted = [currency for currency in derived if currency != 'btc']
+        if reference is not None and not reference.empty:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                references = dict(zip(quoted, executor.map(
+                    lambda currency: fetch_market_chart_frame(session, reference_coin, base_url, days, cache, currency),
+                    quoted,
+                )))
+        else:
+            references = {}
+
+        result = {}
+        for currency in currencies:
+            if currency == base_currency:
+                result[currency] = {coin: frames[coin] for coin in coins}
+                continue
+            if reference is None or reference.empty:
+                rates = None
+            elif currency == 'btc':
+                rates = conversion_rates(reference)
+            elif not references[currency].empty:
+                rates = conversion_rates(reference, references[currency])
+            else:
+                rates = None
+            if rates is None or not len(rates[0]):
+                # No usable reference: ask for this currency directly
+                result[currency] = get_market_frames_batch(coins, max_workers, session, base_url, days, cache, currency)
+                continue
+            result[currency] = {coin: frames[coin] if frames[coin].empty else convert(frames[coin], *rates) for coin in coins}
+        return result
+    finally:
+        if own_session:
+            session.close()
@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from coingecko_client import CoinGeckoClient, base_url, max_concurrency
+from ingest import decode_market_chart, parse_market_chart_body, split_frame
+from market_cache import granularity_ms
+from profiler import add_bytes, stage
+
+
+def fetch_market_chart(session, coin, base_url=base_url, days=30, cache=None, vs_currency='usd'):
+    df = fetch_market_chart_frame(session, coin, base_url, days, cache, vs_currency)
+    if df.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    return split_frame(df)
+
+
+def fetch_market_chart_frame(session, coin, base_url=base_url, days=30, cache=None, vs_currency='usd'):
+    # Price, volume and market cap of one coin in one aligned frame; empty if it could not be fetched
+    with stage('fetch', coin):
+        if cache is not None:
+            return fetch_market_chart_cached(session, coin, cache, base_url, days, vs_currency)
+        return _fetch_market_chart(session, coin, base_url, days, vs_currency)
+
+
+def _fetch_market_chart(session, coin, base_url, days, vs_currency):
+    url = f'{base_url}coins/{coin}/market_chart'
+    try:
+        response = session.get(url, params={'vs_currency': vs_currency, 'days': days})
+    except requests.RequestException as exc:
+        print(f'Error: Could not retrieve data for {coin}. {exc}')
+        return pd.DataFrame()
+    if response.status_code != 200:
+        print(f'Error: Could not retrieve data for {coin}. Status code: {response.status_code}.')
+        return pd.DataFrame()
+    add_bytes(len(response.content))
+    return parse_market_chart_body(response.content)
+
+
+def fetch_market_chart_cached(session, coin, cache, base_url=base_url, days=30, vs_currency='usd'):
+    # Serve from the cache when it is fresh, otherwise only ask for the
+    # points newer than the last cached one and merge them in. A window
+    # reaching back before what the cache holds, or needing finer points,
+    # is fetched in full.
+    now_ms = int(time.time() * 1000)
+    since_ms = now_ms - days * 24 * 3600 * 1000
+    last_ms = cache.last_timestamp(coin, vs_currency)
+    first_ms, step_ms = cache.coverage(coin, vs_currency)
+    full = (
+        last_ms is None or last_ms < since_ms or first_ms is None or since_ms < first_ms
+        or (step_ms is not None and step_ms > 1.5 * granularity_ms(days))
+    )
+    if full:
+        cache.record_miss()
+        url = f'{base_url}coins/{coin}/market_chart'
+        params = {'vs_currency': vs_currency, 'days': days}
+    elif cache.is_fresh(coin, vs_currency):
+        cache.record_hit()
+        return cache.load_frame(coin, since_ms, vs_currency)
+    else:
+        cache.record_hit()
+        url = f'{base_url}coins/{coin}/market_chart/range'
+        params = {'vs_currency': vs_currency, 'from': last_ms // 1000 + 1, 'to': now_ms // 1000}
+    try:
+        response = session.get(url, params=params)
+    except requests.RequestException as exc:
+        print(f'Error: Could not retrieve data for {coin}. {exc}')
+        response = None
+    if response is None or response.status_code != 200:
+        if response is not None:
+            print(f'Error: Could not retrieve data for {coin}. Status code: {response.status_code}.')
+        if last_ms is None:
+            return pd.DataFrame()
+        # Fall back to whatever is cached rather than dropping the coin
+        return cache.load_frame(coin, since_ms, vs_currency)
+    add_bytes(len(response.content))
+    arrays = decode_market_chart(response.content)
+    if full:
+        cache.store(coin, arrays, vs_currency, since_ms)
+        # Everything the fetch returned, as the uncached path would
+        if len(arrays['prices']):
+            since_ms = min(since_ms, int(arrays['prices'][:, 0].min()))
+    else:
+        cache.store(coin, arrays, vs_currency)
+    return cache.load_frame(coin, since_ms, vs_currency)
+
+
+def _fetch_many(fetch, coins, max_workers, session):
+    coins = list(dict.fromkeys(coins))
+    own_session = session is None
+    if own_session:
+        session = CoinGeckoClient(pool_size=max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(coins, executor.map(lambda coin: fetch(session, coin), coins)))
+    finally:
+        if own_session:
+            session.close()
+
+
+def get_historical_data_batch(coins, max_workers=max_concurrency, session=None, base_url=base_url, days=30, cache=None,
+                              vs_currency='usd'):
+    """Fetch the market charts of many coins concurrently.
+
+    At most `max_workers` requests are in flight at once, all going through
+    one rate-limited `CoinGeckoClient` (pass `session` to supply your own). Returns a dict mapping each coin to the same
+    `(prices_df, volume_df)` pair `get_historical_data` returns; coins that
+    could not be fetched map to two empty DataFrames. Pass a
+    `MarketChartCache` as `cache` to only download points that are not
+    cached yet, and `vs_currency` to quote them in another currency.
+    """
+    return _fetch_many(
+        lambda session, coin: fetch_market_chart(session, coin, base_url, days, cache, vs_currency), coins, max_workers, session
+    )
+
+
+def get_market_frames_batch(coins, max_workers=max_concurrency, session=None, base_url=base_url, days=30, cache=None,
+                            vs_currency='usd'):
+    # Like get_historical_data_batch, but each coin maps to one frame with
+    # price, volume and market cap (empty if it could not be fetched)
+    return _fetch_many(
+        lambda session, coin: fetch_market_chart_frame(session, coin, base_url, days, cache, vs_currency),
+        coins, max_workers, session,
+    )
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+DAY_MS = 24 * 3600 * 1000
+
+
+def to_epoch_ms(timestamps):
+    return np.asarray(timestamps, dtype='datetime64[ms]').astype(np.int64)
+
+
+class IncrementalCleaner:
+    """Online version of clean_data's daily resampling.
+
+    Keeps a running sum and count of price and volume for every day, so
+    each update only touches the days its new rows fall in. `frame()`
+    returns the same frame clean_data would build from the full history.
+    Rows are expected in time order: anything not newer than the last row
+    already seen is treated as a resend and ignored.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.last_timestamp = None
+
+    @classmethod
+    def from_frames(cls, prices_df, volume_df):
+        cleaner = cls()
+        cleaner.update_frames(prices_df, volume_df)
+        return cleaner
+
+    def update_frames(self, prices_df, volume_df):
+        # Same inner join on timestamp that clean_data does, on the new rows only
+        df = pd.merge(prices_df, volume_df, on='timestamp')
+        return self.update(df['timestamp'], df['price'], df['volume'])
+
+    def update(self, timestamps, prices, volumes):
+        timestamps = to_epoch_ms(timestamps)
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        if self.last_timestamp is not None:
+            keep = timestamps > self.last_timestamp
+            timestamps, prices, volumes = timestamps[keep], prices[keep], volumes[keep]
+        if timestamps.size == 0:
+            return self
+        self.last_timestamp = int(timestamps.max())
+        days, inverse = np.unique(timestamps // DAY_MS, return_inverse=True)
+        price_ok = ~np.isnan(prices)
+        volume_ok = ~np.isnan(volumes)
+        sums = np.stack(
+            [
+                np.bincount(inverse, weights=np.where(price_ok, prices, 0.0), minlength=days.size),
+                np.bincount(inverse, weights=price_ok, minlength=days.size),
+                np.bincount(inverse, weights=np.where(volume_ok, volumes, 0.0), minlength=days.size),
+                np.bincount(inverse, weights=volume_ok, minlength=days.size),
+            ],
+            axis=1,
+        )
+        for day, row in zip(days.tolist(), sums):
+            bucket = self.buckets.get(day)
+            if bucket is None:
+                self.buckets[day] = row
+            else:
+                bucket += row
+        return self
+
+    def frame(self):
+        if not self.buckets:
+            return pd.DataFrame(columns=['timestamp', 'price', 'volume'])
+        first, last = min(self.buckets), max(self.buckets)
+        sums = np.full((last - first + 1, 4), np.nan)
+        for day, row in self.buckets.items():
+            sums[day - first] = row
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price = sums[:, 0] / sums[:, 1]
+            volume = sums[:, 2] / sums[:, 3]
+        days = np.arange(first, last + 1, dtype=np.int64)
+        return pd.DataFrame(
+            {
+                'timestamp': pd.to_datetime(days * DAY_MS, unit='ms'),
+                'price': price,
+                'volume': volume,
+            }
+        )
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from correlation import align_frames
+from rolling import column_centres, trailing_sums
+
+
+def rolling_sum(values, window):
+    """Sum of each full `window`-row trailing window of a 2-D (time, coin)
+    array, NaN where the window is not full or holds a NaN. O(n) per
+    column through cumulative sums."""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    full = trailing_sums(valid, window) == window
+    return np.where(full, trailing_sums(np.where(valid, values, 0.0), window), np.nan)
+
+
+def sma(values, window):
+    centre = column_centres(values)
+    return rolling_sum(values - centre, window) / window + centre
+
+
+def rolling_std(values, window):
+    # Sample standard deviation of each full trailing window
+    centred = values - column_centres(values)
+    with np.errstate(invalid='ignore'):
+        s = rolling_sum(centred, window)
+        ss = rolling_sum(centred ** 2, window)
+        return np.sqrt(np.maximum(ss - s * s / window, 0.0) / (window - 1))
+
+
+def ema(values, span, seed=None):
+    """Exponential moving average with alpha = 2 / (span + 1), skipping NaNs.
+
+    `seed` is the average just before the first row (one value per coin),
+    so a later batch of rows continues exactly where the previous one
+    stopped.
+    """
+    df = pd.DataFrame(values)
+    if seed is not None:
+        df = pd.concat([pd.DataFrame([seed]), df], ignore_index=True)
+    out = df.ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy()
+    return out[1:] if seed is not None else out
+
+
+def log_returns(prices):
+    # Same shape as prices; the first row has no previous price and is NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = np.diff(np.log(prices), axis=0)
+    return np.vstack([np.full((1, prices.shape[1]), np.nan), out])
+
+
+class IndicatorEngine:
+    """Technical indicators of many coins' clean_data frames, in one batch.
+
+    Every coin is a column of one (time, coin) array and each indicator is
+    a vectorized pass over all columns: rolling sums for SMA, volatility
+    and VWAP, running maxima for drawdowns, and pandas' ewm for EMAs.
+    `compute` starts from a full history; `update` then takes only the
+    bars newer than the last one seen and keeps just enough tail state
+    (the last rows, EMA values, price peaks, drawdowns) to extend every
+    indicator exactly as if it had been computed from the full history.
+    Bars must be final when they are passed in; rows not newer than the
+    last bar are ignored as resends.
+    """
+
+    def __init__(self, sma_windows=(7, 30), ema_spans=(12, 26), volatility_window=30, vwap_window=30):
+        self.sma_windows = tuple(sma_windows)
+        self.ema_spans = tuple(ema_spans)
+        self.volatility_window = volatility_window
+        self.vwap_window = vwap_window
+        # Rows kept between updates: the longest window, plus one for returns
+        self.tail_length = max(self.sma_windows + (volatility_window + 1, vwap_window))
+        self.coins = None
+        self.latest = None
+
+    def _reset(self, coins):
+        n = len(coins)
+        self.coins = list(coins)
+        self.last_timestamp = None
+        self._tail_prices = np.empty((0, n))
+        self._tail_volumes = np.empty((0, n))
+        self._ema = {span: None for span in self.ema_spans}
+        self._peak = np.full(n, np.nan)
+        self._max_drawdown = np.full(n, np.nan)
+        self._first_price = np.full(n, np.nan)
+
+    def compute(self, frames):
+        # frames maps each coin to its clean_data frame; restarts from scratch
+        self._reset(frames)
+        return self.update(frames)
+
+    def update(self, frames):
+        """Indicators of the bars in `frames` newer than the last one seen.
+
+        Returns a dict mapping each indicator name to a (timestamp, coin)
+        DataFrame holding the new bars only.
+        """
+        if self.coins is None:
+            return self.compute(frames)
+        prices = align_frames(frames, 'price').reindex(columns=self.coins)
+        volumes = align_frames(frames, 'volume').reindex(index=prices.index, columns=self.coins)
+        if self.last_timestamp is not None:
+            keep = prices.index > self.last_timestamp
+            prices, volumes = prices[keep], volumes[keep]
+        if prices.empty:
+            return {}
+        index = prices.index
+        self.last_timestamp = index[-1]
+        new_prices = prices.to_numpy(dtype=float)
+        new_volumes = volumes.to_numpy(dtype=float)
+        skip = len(self._tail_prices)
+        all_prices = np.vstack([self._tail_prices, new_prices])
+        all_volumes = np.vstack([self._tail_volumes, new_volumes])
+
+        out = {}
+        returns = log_returns(all_prices)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['return'] = np.expm1(returns)[skip:]
+        out['log_return'] = returns[skip:]
+        for window in self.sma_windows:
+            out[f'sma_{window}'] = sma(all_prices, window)[skip:]
+        for span in self.ema_spans:
+            out[f'ema_{span}'] = ema(new_prices, span, self._ema[span])
+            self._ema[span] = out[f'ema_{span}'][-1]
+        out[f'volatility_{self.volatility_window}'] = rolling_std(returns, self.volatility_window)[skip:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[f'vwap_{self.vwap_window}'] = (
+                rolling_sum(all_prices * all_volumes, self.vwap_window)
+                / rolling_sum(np.where(np.isnan(all_prices), np.nan, all_volumes), self.vwap_window)
+            )[skip:]
+        peaks = np.fmax.accumulate(np.vstack([self._peak, new_prices]), axis=0)[1:]
+        self._peak = peaks[-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['drawdown'] = new_prices / peaks - 1
+        self._max_drawdown = np.fmin.reduce(np.vstack([self._max_drawdown, out['drawdown']]), axis=0)
+        self._first_price = np.where(np.isnan(self._first_price), _first_valid(new_prices), self._first_price)
+
+        self._tail_prices = all_prices[-self.tail_length:]
+        self._tail_volumes = all_volumes[-self.tail_length:]
+        self.latest = {name: values[-1] for name, values in out.items()}
+        self.latest['price'] = _last_valid(all_prices)
+        return {name: pd.DataFrame(values, index=index, columns=self.coins) for name, values in out.items()}
+
+    def summary(self):
+        """The latest value of every indicator per coin, with the total
+        return and maximum drawdown so far, one row per coin (a get_stats
+        style table)."""
+        if self.latest is None:
+            return pd.DataFrame()
+        table = pd.DataFrame(self.latest, index=self.coins)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['total_return'] = self.latest['price'] / self._first_price - 1
+        table['max_drawdown'] = self._max_drawdown
+        return table
+
+
+def _first_valid(values):
+    # First non-NaN value of each column (NaN for all-NaN columns)
+    valid = ~np.isnan(values)
+    rows = np.where(valid.any(axis=0), valid.argmax(axis=0), 0)
+    return np.where(valid.any(axis=0), values[rows, np.arange(values.shape[1])], np.nan)
+
+
+def _last_valid(values):
+    return _first_valid(values[::-1])
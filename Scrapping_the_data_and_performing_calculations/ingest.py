@@ -0,0 +1,110 @@
+import json
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# market_chart series and the frame column each one becomes
+series_columns = {'prices': 'price', 'total_volumes': 'volume', 'market_caps': 'market_cap'}
+
+_brackets = bytes.maketrans(b'[]', b'  ')
+
+
+def _loads(body):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _scan_series(body, key):
+    # The [[t, v], ...] array of `key` parsed in C by np.fromstring, or
+    # None when the body is not laid out the way this scan expects
+    match = re.search(b'"%s"\\s*:\\s*\\[\\s*([\\[\\]])' % key.encode(), body)
+    if match is None:
+        return None
+    if match.group(1) == b']':
+        return np.empty((0, 2))
+    end = body.find(b']]', match.end())
+    if end < 0:
+        return None
+    segment = body[match.start(1):end + 2].translate(_brackets)
+    # Anything but plain numbers (a null, say) stops the scan early, which
+    # NumPy reports as a warning or, in newer releases, an error
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(segment, sep=',')
+        except (ValueError, DeprecationWarning):
+            return None
+    if values.size != segment.count(b',') + 1 or values.size % 2:
+        return None
+    return values.reshape(-1, 2)
+
+
+def decode_market_chart(body):
+    """Decode a market_chart response body into one (n, 2) float array per series.
+
+    The [timestamp, value] pairs are parsed straight from the raw bytes
+    into NumPy, without building a Python list and float object for every
+    point. Bodies the fast scan cannot handle, such as ones with null values,
+    go through the JSON parser instead (orjson when it is installed).
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    arrays = {key: _scan_series(body, key) for key in series_columns}
+    if any(array is None for array in arrays.values()):
+        data = _loads(body)
+        arrays = {
+            key: np.asarray([point for point in data.get(key, []) if None not in point], dtype=float).reshape(-1, 2)
+            for key in series_columns
+        }
+    return arrays
+
+
+def _series_frame(points, column):
+    return pd.DataFrame({
+        'timestamp': points[:, 0].astype(np.int64).view('datetime64[ms]'),
+        column: points[:, 1],
+    })
+
+
+def market_chart_frame(arrays):
+    """One frame with timestamp, price, volume and market_cap columns.
+
+    When every series has the same timestamps, which is how CoinGecko
+    sends them, they are converted to datetime64 once and the value
+    columns are put side by side without a merge. Otherwise price and
+    volume are inner-joined on timestamp as clean_data does, and market
+    caps are matched where they exist.
+    """
+    prices = arrays['prices']
+    timestamps = prices[:, 0]
+    if all(np.array_equal(arrays[key][:, 0], timestamps) for key in series_columns):
+        return pd.DataFrame({
+            'timestamp': timestamps.astype(np.int64).view('datetime64[ms]'),
+            **{column: arrays[key][:, 1] for key, column in series_columns.items()},
+        })
+    df = pd.merge(_series_frame(prices, 'price'), _series_frame(arrays['total_volumes'], 'volume'), on='timestamp')
+    return pd.merge(df, _series_frame(arrays['market_caps'], 'market_cap'), on='timestamp', how='left')
+
+
+def parse_market_chart_body(body):
+    # The aligned frame of a raw market_chart response body
+    return market_chart_frame(decode_market_chart(body))
+
+
+def align_points(prices_df, volume_df):
+    # Price and volume side by side; the merge clean_data used to do is
+    # only needed when their timestamps differ
+    if prices_df['timestamp'].equals(volume_df['timestamp']):
+        return pd.concat([prices_df[['timestamp', 'price']], volume_df[['volume']]], axis=1)
+    return pd.merge(prices_df, volume_df, on='timestamp')
+
+
+def split_frame(df):
+    # The (prices_df, volume_df) pair get_historical_data returns, from an aligned frame
+    return df[['timestamp', 'price']], df[['timestamp', 'volume']]
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import numpy as np
+import requests
+
+from coingecko_client import CoinGeckoClient, base_url
+
+# simple/price takes a comma-separated id list; 500 ids keep the URL under ~8 KB
+max_ids_per_request = 500
+
+
+def fetch_simple_prices(client, coins, vs_currency='usd', base_url=base_url):
+    # Current price of every coin, in one simple/price request per 500 coins
+    prices = {}
+    for start in range(0, len(coins), max_ids_per_request):
+        ids = ','.join(coins[start:start + max_ids_per_request])
+        response = client.get(f'{base_url}simple/price', params={'ids': ids, 'vs_currencies': vs_currency})
+        if response.status_code != 200:
+            print(f'Error: Could not retrieve current prices. Status code: {response.status_code}.')
+            continue
+        for coin, quote in response.json().items():
+            if vs_currency in quote:
+                prices[coin] = quote[vs_currency]
+    return prices
+
+
+class LiveStats:
+    """Running statistics of many coins, updated one tick at a time.
+
+    Per-coin count, mean, variance, min and max are Welford updates on
+    vectors indexed by coin, and the correlation matrix comes from running
+    co-moments kept per pair of coins, so each tick costs O(coins^2) no
+    matter how long the series already is. Coins missing from a tick keep
+    their stats and enter the co-moments with their last known price. A
+    pair starts accumulating once both of its coins have been seen, so a
+    coin that is never quoted only leaves its own row and column NaN.
+    """
+
+    def __init__(self, coins):
+        self.coins = list(coins)
+        n = len(self.coins)
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        self.last = np.full(n, np.nan)
+        # Per pair (i, j): ticks both were seen, mean of i over them, and the
+        # co-moment of i with j and of i with itself over the same ticks
+        self.pair_count = np.zeros((n, n), dtype=np.int64)
+        self._pair_mean = np.zeros((n, n))
+        self._comoment = np.zeros((n, n))
+        self._pair_m2 = np.zeros((n, n))
+
+    def update(self, prices):
+        # prices is a float array in `coins` order, NaN where a coin is missing
+        seen = ~np.isnan(prices)
+        self.count += seen
+        delta = np.where(seen, prices - self.mean, 0.0)
+        self.mean += np.divide(delta, self.count, out=np.zeros_like(delta), where=seen)
+        self.m2 += np.where(seen, delta * (prices - self.mean), 0.0)
+        self.min = np.fmin(self.min, prices)
+        self.max = np.fmax(self.max, prices)
+        self.last = np.where(seen, prices, self.last)
+        active = ~np.isnan(self.last)
+        both = np.outer(active, active)
+        self.pair_count += both
+        x = np.where(active, self.last, 0.0)[:, None]
+        delta = np.where(both, x - self._pair_mean, 0.0)
+        self._pair_mean += np.divide(delta, self.pair_count, out=np.zeros_like(delta), where=both)
+        # The mean of j over the same ticks is the transposed matrix
+        self._comoment += np.where(both, delta * (x.T - self._pair_mean.T), 0.0)
+        self._pair_m2 += np.where(both, delta * (x - self._pair_mean), 0.0)
+
+    def std_dev(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def correlation(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(
+                self.pair_count > 0, self._comoment / np.sqrt(self._pair_m2 * self._pair_m2.T), np.nan
+            )
+
+    def summary(self, coin):
+        i = self.coins.index(coin)
+        return {
+            'avg_price': self.mean[i],
+            'std_dev_price': self.std_dev()[i],
+            'min_price': self.min[i],
+            'max_price': self.max[i],
+            'current_price': self.last[i],
+        }
+
+
+class LivePoller:
+    """Polls simple/price for every tracked coin once per `interval` seconds.
+
+    Each tick is a single batched request; the prices are appended to an
+    in-memory (tick, coin) series and folded into `LiveStats`. `metrics()`
+    reports request latency, update cost and throughput.
+    """
+
+    def __init__(self, coins, client=None, interval=60, vs_currency='usd', base_url=base_url):
+        self.coins = list(coins)
+        self.client = client or CoinGeckoClient()
+        self.interval = interval
+        self.vs_currency = vs_currency
+        self.base_url = base_url
+        self.stats = LiveStats(self.coins)
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.prices = np.empty((0, len(self.coins)))
+        self.length = 0
+        self._positions = {coin: i for i, coin in enumerate(self.coins)}
+        self._stop = threading.Event()
+        self._metrics = {'ticks': 0, 'failed_ticks': 0, 'points': 0, 'request_seconds': 0.0, 'update_seconds': 0.0,
+                         'last_request_seconds': 0.0, 'last_update_seconds': 0.0}
+        self._started = time.monotonic()
+
+    def _append(self, timestamp_ms, row):
+        if self.length == len(self.timestamps):
+            # Grow by doubling, so appends stay amortised O(1)
+            capacity = max(16, 2 * self.length)
+            self.timestamps = np.resize(self.timestamps, capacity)
+            prices = np.full((capacity, len(self.coins)), np.nan)
+            prices[: self.length] = self.prices[: self.length]
+            self.prices = prices
+        self.timestamps[self.length] = timestamp_ms
+        self.prices[self.length] = row
+        self.length += 1
+
+    def series(self):
+        # (timestamps, prices) received so far; prices is (ticks, coins)
+        return self.timestamps[: self.length], self.prices[: self.length]
+
+    def poll_once(self):
+        started = time.monotonic()
+        try:
+            quotes = fetch_simple_prices(self.client, self.coins, self.vs_currency, self.base_url)
+        except requests.RequestException as exc:
+            print(f'Error: Could not retrieve current prices. {exc}')
+            quotes = {}
+        fetched = time.monotonic()
+        self._metrics['last_request_seconds'] = fetched - started
+        self._metrics['request_seconds'] += fetched - started
+        if not quotes:
+            self._metrics['failed_ticks'] += 1
+            return False
+        row = np.full(len(self.coins), np.nan)
+        for coin, price in quotes.items():
+            if coin in self._positions:
+                row[self._positions[coin]] = price
+        self._append(int(time.time() * 1000), row)
+        self.stats.update(row)
+        updated = time.monotonic()
+        self._metrics['last_update_seconds'] = updated - fetched
+        self._metrics['update_seconds'] += updated - fetched
+        self._metrics['ticks'] += 1
+        self._metrics['points'] += len(quotes)
+        return True
+
+    def run(self, max_ticks=None, on_tick=None):
+        # Tick on a fixed schedule until stop() is called or max_ticks is reached;
+        # on_tick(poller) runs after every poll, inside the tick's time budget
+        next_tick = time.monotonic()
+        ticks = 0
+        while not self._stop.is_set():
+            self.poll_once()
+            if on_tick is not None:
+                on_tick(self)
+            ticks += 1
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            next_tick += self.interval
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    def stop(self):
+        self._stop.set()
+
+    def metrics(self):
+        metrics = dict(self._metrics)
+        metrics['mean_request_seconds'] = metrics['request_seconds'] / max(metrics['ticks'] + metrics['failed_ticks'], 1)
+        metrics['mean_update_seconds'] = metrics['update_seconds'] / max(metrics['ticks'], 1)
+        metrics['points_per_second'] = metrics['points'] / (time.monotonic() - self._started)
+        return metrics
+
+
+def print_tick(poller):
+    for coin in poller.coins:
+        summary = poller.stats.summary(coin)
+        print(f"{coin.capitalize()}: ${summary['current_price']:,.2f} (avg {summary['avg_price']:,.2f})")
+    print(f"Correlation: {poller.stats.correlation()[0, 1]:.2f}, metrics: {poller.metrics()}\n")
+
+
+if __name__ == '__main__':
+    poller = LivePoller(['bitcoin', 'ethereum'])
+    try:
+        poller.run(on_tick=print_tick)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,244 @@
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingest import market_chart_frame
+
+# CoinGecko payload keys and the metric names they are cached under
+metrics = {'prices': 'price', 'total_volumes': 'volume', 'market_caps': 'market_cap'}
+
+
+def granularity_ms(days):
+    # The spacing CoinGecko picks for a market_chart of `days` days
+    if days <= 1:
+        return 5 * 60 * 1000
+    if days <= 90:
+        return 3600 * 1000
+    return 24 * 3600 * 1000
+
+
+def _arrays(data):
+    # One (n, 2) float array per series, from decode_market_chart output or
+    # a parsed JSON payload; points without a value are left out
+    arrays = {}
+    for key in metrics:
+        points = np.asarray(data.get(key, []), dtype=float).reshape(-1, 2)
+        arrays[key] = points[~np.isnan(points).any(axis=1)]
+    return arrays
+
+
+def _spacing(points):
+    # Typical gap between consecutive points, None with fewer than two
+    if len(points) < 2:
+        return None
+    return int(np.median(np.diff(np.sort(points[:, 0]))))
+
+
+def _thin(arrays, last_ms, step_ms):
+    # Drop the points closer than about step_ms to the previous kept one,
+    # so finer points from a short range refresh match the cached spacing
+    kept = []
+    previous = last_ms
+    for t in np.sort(arrays['prices'][:, 0]).tolist():
+        if previous is None or t - previous >= 0.9 * step_ms:
+            kept.append(t)
+            previous = t
+    return {key: points[np.isin(points[:, 0], kept)] for key, points in arrays.items()}
+
+
+class MarketChartCache:
+    """Persistent SQLite cache of CoinGecko market_chart data points.
+
+    Points are keyed by coin, vs_currency, metric and timestamp (epoch ms),
+    so a refresh only has to add the points newer than the last cached one.
+    Each series also records how far back it is complete and the spacing of
+    its points, so a request reaching further back (or needing finer
+    points) triggers a full fetch, and refreshes are thinned to match.
+    A series that has not been refreshed for `ttl` seconds is dropped, and
+    once more than `max_points` points are stored the least recently used
+    series are evicted first. `refresh_interval` is how long a series is
+    served straight from disk before the network is asked for newer points.
+    """
+
+    def __init__(self, path='market_chart_cache.sqlite', ttl=7 * 24 * 3600, max_points=5_000_000, refresh_interval=60):
+        self.path = path
+        self.ttl = ttl
+        self.max_points = max_points
+        self.refresh_interval = refresh_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL with NORMAL sync commits without an fsync per store; a crash can
+        # lose the last stores but never corrupts the file
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(
+            '''
+            CREATE TABLE IF NOT EXISTS points (
+                coin TEXT, vs_currency TEXT, metric TEXT, timestamp INTEGER, value REAL,
+                PRIMARY KEY (coin, vs_currency, metric, timestamp)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS series (
+                coin TEXT, vs_currency TEXT, fetched_at REAL, last_access REAL,
+                first_timestamp INTEGER, step_ms INTEGER,
+                PRIMARY KEY (coin, vs_currency)
+            );
+            '''
+        )
+        # Cache files written before coverage was tracked
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(series)')}
+        for column in ('first_timestamp', 'step_ms'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE series ADD COLUMN {column} INTEGER')
+
+    def close(self):
+        self._conn.close()
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            n_points = self._conn.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+            n_series = self._conn.execute('SELECT COUNT(*) FROM series').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'series': n_series, 'points': n_points}
+
+    def _last_timestamp(self, coin, vs_currency):
+        return self._conn.execute(
+            'SELECT MAX(timestamp) FROM points WHERE coin = ? AND vs_currency = ? AND metric = ?',
+            (coin, vs_currency, 'price'),
+        ).fetchone()[0]
+
+    def last_timestamp(self, coin, vs_currency='usd'):
+        with self._lock:
+            return self._last_timestamp(coin, vs_currency)
+
+    def _coverage(self, coin, vs_currency):
+        row = self._conn.execute(
+            'SELECT first_timestamp, step_ms FROM series WHERE coin = ? AND vs_currency = ?', (coin, vs_currency)
+        ).fetchone()
+        return tuple(row) if row is not None else (None, None)
+
+    def coverage(self, coin, vs_currency='usd'):
+        # (earliest timestamp the series is complete from, spacing of its points in ms)
+        with self._lock:
+            return self._coverage(coin, vs_currency)
+
+    def is_fresh(self, coin, vs_currency='usd'):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT fetched_at FROM series WHERE coin = ? AND vs_currency = ?', (coin, vs_currency)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.refresh_interval
+
+    def store(self, coin, data, vs_currency='usd', since_ms=None):
+        """Merge a market_chart(/range) payload into the cached series.
+
+        `data` is either the arrays decode_market_chart returns or a parsed
+        JSON payload. Pass `since_ms` for a full market_chart fetch: the
+        series is then complete from since_ms at the spacing of the
+        payload's points, and replaces the cached points if that spacing
+        differs or they end before since_ms. Without it the payload is a
+        refresh, thinned to the cached spacing.
+        """
+        now = time.time()
+        arrays = _arrays(data)
+        with self._lock, self._conn:
+            first_ms, step_ms = self._coverage(coin, vs_currency)
+            if since_ms is not None:
+                spacing = _spacing(arrays['prices'])
+                last_ms = self._last_timestamp(coin, vs_currency)
+                resampled = spacing is not None and step_ms is not None and not 0.5 < spacing / step_ms < 2
+                if resampled or (last_ms is not None and last_ms < since_ms):
+                    # A different spacing, or cached points ending before the
+                    # new ones start: the old points would leave a hole
+                    self._conn.execute('DELETE FROM points WHERE coin = ? AND vs_currency = ?', (coin, vs_currency))
+                    first_ms = None
+                step_ms = spacing or step_ms
+                first_ms = since_ms if first_ms is None else min(first_ms, since_ms)
+            elif step_ms:
+                arrays = _thin(arrays, self._last_timestamp(coin, vs_currency), step_ms)
+            for key, metric in metrics.items():
+                points = arrays[key]
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?)',
+                    ((coin, vs_currency, metric, t, v)
+                     for t, v in zip(points[:, 0].astype(np.int64).tolist(), points[:, 1].tolist())),
+                )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?)',
+                (coin, vs_currency, now, now, first_ms, step_ms),
+            )
+            # In the same transaction, so a store is one commit
+            self._evict()
+
+    def _rows(self, coin, since_ms, vs_currency, metric):
+        return self._conn.execute(
+            'SELECT timestamp, value FROM points '
+            'WHERE coin = ? AND vs_currency = ? AND metric = ? AND timestamp >= ? ORDER BY timestamp',
+            (coin, vs_currency, metric, since_ms),
+        ).fetchall()
+
+    def _touch(self, coin, vs_currency):
+        self._conn.execute(
+            'UPDATE series SET last_access = ? WHERE coin = ? AND vs_currency = ?',
+            (time.time(), coin, vs_currency),
+        )
+
+    def load(self, coin, since_ms=0, vs_currency='usd'):
+        # The (prices_df, volume_df) pair get_historical_data returns
+        with self._lock:
+            self._touch(coin, vs_currency)
+            frames = []
+            for metric in ('price', 'volume'):
+                df = pd.DataFrame(self._rows(coin, since_ms, vs_currency, metric), columns=['timestamp', metric])
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+                frames.append(df)
+        return tuple(frames)
+
+    def load_frame(self, coin, since_ms=0, vs_currency='usd'):
+        # Every cached metric of a coin in one aligned frame, as ingest.market_chart_frame builds it
+        with self._lock:
+            self._touch(coin, vs_currency)
+            arrays = {
+                key: np.array(self._rows(coin, since_ms, vs_currency, metric), dtype=float).reshape(-1, 2)
+                for key, metric in metrics.items()
+            }
+        return market_chart_frame(arrays)
+
+    def evict(self):
+        with self._lock, self._conn:
+            self._evict()
+
+    def _evict(self):
+        expired = self._conn.execute(
+            'SELECT coin, vs_currency FROM series WHERE fetched_at < ?', (time.time() - self.ttl,)
+        ).fetchall()
+        for key in expired:
+            self._drop(*key)
+        total = self._conn.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+        if total <= self.max_points:
+            return
+        lru = self._conn.execute(
+            'SELECT coin, vs_currency FROM series ORDER BY last_access'
+        ).fetchall()
+        for coin, vs_currency in lru:
+            if total <= self.max_points:
+                break
+            total -= self._drop(coin, vs_currency)
+
+    def _drop(self, coin, vs_currency):
+        removed = self._conn.execute(
+            'DELETE FROM points WHERE coin = ? AND vs_currency = ?', (coin, vs_currency)
+        ).rowcount
+        self._conn.execute('DELETE FROM series WHERE coin = ? AND vs_currency = ?', (coin, vs_currency))
+        return removed
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from rolling import column_centres, trailing_sums
+
+# MAD of a normal distribution is 0.6745 sigma; this rescales it to sigma
+mad_to_sigma = 1.4826
+
+
+def _stack(series_list):
+    # Columns of unequal length padded with NaN into one (time, coin) array
+    length = max((len(s) for s in series_list), default=0)
+    values = np.full((length, len(series_list)), np.nan)
+    for i, s in enumerate(series_list):
+        values[: len(s), i] = s
+    return values
+
+
+def rolling_zscore_mask(values, window, threshold=3.0):
+    """Points more than `threshold` standard deviations from the mean of the
+    `window` points before them, for a 2-D (time, coin) array. O(n) per
+    column through cumulative sums.
+
+    This assumes the values hover around a level. A trending or random-walk
+    price sits far from its trailing mean all the time, so run it on log
+    returns (detect_outliers(..., on='log_returns')) rather than on prices.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    centred = np.where(valid, values - column_centres(values), 0.0)
+    # Sums over the `window` points before each row
+    n = trailing_sums(valid, window, lag=1)
+    s = trailing_sums(centred, window, lag=1)
+    ss = trailing_sums(centred ** 2, window, lag=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = s / n
+        std = np.sqrt(np.maximum(ss - s * mean, 0.0) / (n - 1))
+        z = np.abs(centred - mean) / std
+    return valid & (n == window) & (z > threshold)
+
+
+def rolling_mad_mask(values, window, threshold=3.5):
+    """Points whose distance from the trailing rolling median is more than
+    `threshold` robust sigmas, the sigma being the rolling median of those
+    distances (a streaming approximation of the rolling MAD)."""
+    df = pd.DataFrame(np.asarray(values, dtype=float))
+    median = df.rolling(window).median().shift(1)
+    deviation = (df - median).abs()
+    mad = deviation.rolling(window).median().shift(1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = deviation / (mad_to_sigma * mad)
+    return (score > threshold).to_numpy()
+
+
+def rolling_iqr_mask(values, window, k=1.5):
+    # Points outside the Tukey fences of the `window` points before them
+    df = pd.DataFrame(np.asarray(values, dtype=float))
+    rolling = df.rolling(window)
+    q1 = rolling.quantile(0.25).shift(1)
+    q3 = rolling.quantile(0.75).shift(1)
+    iqr = q3 - q1
+    return ((df < q1 - k * iqr) | (df > q3 + k * iqr)).to_numpy()
+
+
+methods = {'zscore': rolling_zscore_mask, 'mad': rolling_mad_mask, 'iqr': rolling_iqr_mask}
+
+
+def detect_outliers(frames, method='zscore', window=24, column='price', on='price', **kwargs):
+    """Rolling outlier detection on the raw ticks of many coins at once.
+
+    `frames` maps each coin to a frame with a `column` column (e.g. the
+    prices_df from get_historical_data, before any resampling). Every coin
+    is scanned in the same vectorized pass. With on='log_returns' the scan
+    runs on the log return into each tick instead of its level, so a spike
+    shows up at its row and usually at the row after it (the way back).
+    Returns a dict mapping each coin to the row positions of its outliers,
+    as an int64 array.
+    """
+    if method not in methods:
+        raise ValueError(f"Unknown method '{method}', expected one of {', '.join(methods)}.")
+    if on not in ('price', 'log_returns'):
+        raise ValueError(f"Unknown series '{on}', expected 'price' or 'log_returns'.")
+    coins = list(frames)
+    lengths = [len(frames[coin]) for coin in coins]
+    values = _stack([frames[coin][column].to_numpy(dtype=float) for coin in coins])
+    if on == 'log_returns':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = np.vstack([np.full((1, values.shape[1]), np.nan), np.diff(np.log(values), axis=0)])
+    mask = methods[method](values, window, **kwargs)
+    return {coin: np.flatnonzero(mask[:length, i]) for i, (coin, length) in enumerate(zip(coins, lengths))}
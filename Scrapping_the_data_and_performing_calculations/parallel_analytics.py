@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from profiler import profiler, stage
+from timeseries_store import TimeSeriesStore
+
+# Below this many coins the pool costs more than it saves, so they are analysed in-process
+min_parallel_coins = 16
+
+# Store arrays placed in shared memory
+shared_arrays = ('offsets', 'timestamps', 'prices', 'volumes')
+
+# Set in each worker process by _attach
+_worker = {}
+
+
+class SharedTimeSeries:
+    """A TimeSeriesStore whose arrays live in shared memory blocks.
+
+    `spec` is all a worker needs to map the same blocks into its own
+    address space, so the points of every coin reach the workers without
+    being pickled. Use as a context manager; the blocks are released on
+    exit.
+    """
+
+    def __init__(self, store):
+        self.coins = store.coins
+        self.blocks = {}
+        self.spec = {'coins': store.coins, 'arrays': {}}
+        for name in shared_arrays:
+            array = np.ascontiguousarray(getattr(store, name))
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks[name] = block
+            self.spec['arrays'][name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _attach(spec, profile=False):
+    if profile:
+        profiler.enable()
+    blocks, arrays = [], []
+    for name in shared_arrays:
+        block_name, shape, dtype = spec['arrays'][name]
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    # The blocks must outlive the arrays viewing them
+    _worker['blocks'] = blocks
+    _worker['store'] = TimeSeriesStore(spec['coins'], *arrays)
+
+
+def _analyze(store, coin, clean, stats):
+    with stage('clean', coin):
+        df = clean(store.prices_df(coin), store.volume_df(coin))
+    with stage('stats', coin):
+        result = stats(df)
+    outliers = result.pop('outliers', None)
+    row = {'coin': coin, 'points': len(store.arrays(coin)[0]), 'days': len(df)}
+    row.update({key: float(value) for key, value in result.items()})
+    row['outliers'] = 0 if outliers is None else len(outliers)
+    return row, df
+
+
+def _analyze_batch(coins, clean, stats):
+    # The batch's results, plus the stage timings it recorded in this worker
+    profiler.reset()
+    results = [_analyze(_worker['store'], coin, clean, stats) for coin in coins]
+    return results, profiler.report()['stages'] if profiler.enabled else []
+
+
+def default_steps():
+    # clean_data and get_stats, imported here because their script imports this module
+    # (a top-level import would be circular) and pulls in the whole pipeline when loaded
+    from scrapping_the_data_and_performing_calculations import clean_data, get_stats
+
+    return clean_data, get_stats
+
+
+def analyze_coins(histories, max_workers=None, clean=None, stats=None):
+    """Clean and summarise many coins on every core.
+
+    `histories` maps each coin to its `(prices_df, volume_df)` pair, as
+    returned by get_historical_data_batch. The points are packed into a
+    TimeSeriesStore in shared memory and every worker process runs
+    `clean` (clean_data by default) and `stats` (get_stats by default)
+    on its share of the coins, reading the points in place. Only the
+    small daily frames and stats come back. Returns a summary DataFrame
+    with one row of stats per coin, and a dict of the cleaned frames.
+    """
+    if clean is None or stats is None:
+        default_clean, default_stats = default_steps()
+        clean, stats = clean or default_clean, stats or default_stats
+    store = TimeSeriesStore.from_frames(histories)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(store) < min_parallel_coins:
+        results = [_analyze(store, coin, clean, stats) for coin in store.coins]
+    else:
+        # A few batches per worker keeps them all busy without one task per coin
+        batch_size = -(-len(store) // (max_workers * 4))
+        batches = [store.coins[i:i + batch_size] for i in range(0, len(store), batch_size)]
+        with SharedTimeSeries(store) as shared:
+            initargs = (shared.spec, profiler.enabled)
+            with ProcessPoolExecutor(max_workers, initializer=_attach, initargs=initargs) as executor:
+                futures = [executor.submit(_analyze_batch, batch, clean, stats) for batch in batches]
+                results = []
+                for future in futures:
+                    batch_results, stages = future.result()
+                    results.extend(batch_results)
+                    profiler.merge(stages)
+    summary = pd.DataFrame([row for row, _ in results])
+    if not summary.empty:
+        summary = summary.set_index('coin')
+    return summary, {row['coin']: df for row, df in results}
@@ -0,0 +1,68 @@
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Hive-style partition columns added on write: coin=<id>/month=<YYYY-MM>
+partitioning = ds.partitioning(pa.schema([('coin', pa.string()), ('month', pa.string())]), flavor='hive')
+
+
+def _month(timestamp):
+    return pd.Timestamp(timestamp).strftime('%Y-%m')
+
+
+def write_parquet(frames, root, compression='zstd'):
+    """Write cleaned frames to a Parquet dataset partitioned by coin and month.
+
+    `frames` maps each coin to its clean_data output. Partitions being
+    written replace what was there before; other coins and months are left
+    alone. Daily data is partitioned by month rather than by day so that
+    files do not end up holding a single row each.
+    """
+    tables = []
+    for coin, df in frames.items():
+        df = df.assign(coin=coin, month=df['timestamp'].dt.strftime('%Y-%m'))
+        tables.append(pa.Table.from_pandas(df, preserve_index=False))
+    ds.write_dataset(
+        pa.concat_tables(tables),
+        root,
+        format='parquet',
+        partitioning=partitioning,
+        existing_data_behavior='delete_matching',
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+    )
+
+
+def read_parquet(root, coins=None, columns=None, start=None, end=None):
+    # Only the partitions, columns and row groups that can match are read
+    dataset = ds.dataset(root, format='parquet', partitioning=partitioning)
+    condition = ds.scalar(True)
+    if coins is not None:
+        condition &= ds.field('coin').isin(list(coins))
+    if start is not None:
+        condition &= (ds.field('month') >= _month(start)) & (ds.field('timestamp') >= pd.Timestamp(start))
+    if end is not None:
+        condition &= (ds.field('month') <= _month(end)) & (ds.field('timestamp') <= pd.Timestamp(end))
+    if columns is not None:
+        columns = ['coin', 'timestamp'] + [c for c in columns if c not in ('coin', 'timestamp')]
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    return df.sort_values(['coin', 'timestamp'], kind='stable').reset_index(drop=True)
+
+
+def read_coin(root, coin, columns=None, start=None, end=None):
+    # The frames of one coin come back exactly as they were written
+    df = read_parquet(root, [coin], columns, start, end)
+    return df.drop(columns=['coin', 'month'], errors='ignore')
+
+
+def frame_to_parquet_buffer(df, compression='zstd'):
+    buffer = BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buffer, compression=compression)
+    buffer.seek(0)
+    return buffer
+
+
+def frame_from_parquet_buffer(buffer, columns=None):
+    return pq.read_table(buffer, columns=columns).to_pandas()
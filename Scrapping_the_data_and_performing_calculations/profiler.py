@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Set to 1 to profile every pipeline run without touching the code
+env_var = 'CRYPTO_PIPELINE_PROFILE'
+
+# Stage totals kept for every (stage, coin) pair
+metric_names = ('calls', 'wall_seconds', 'cpu_seconds', 'bytes', 'peak_memory_bytes')
+
+_disabled = nullcontext()
+
+
+class _Stage:
+    # One timed stage; nested stages pass their memory peak up to their parent
+
+    def __init__(self, profiler, name, coin):
+        self.profiler = profiler
+        self.key = (name, coin or '')
+        self.bytes = 0
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        self.start_memory = current
+        self.peak = current
+        stack.append(self)
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        stack = self.profiler._stack()
+        stack.pop()
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, self.peak)
+            stack[-1].bytes += self.bytes
+        self.profiler._record(self.key, wall, cpu, self.bytes, self.peak - self.start_memory)
+        return False
+
+
+class Profiler:
+    """Per-stage, per-coin timings of one pipeline run.
+
+    Wrap each step in `with profiler.stage('clean', coin):` to record its
+    wall time, CPU time of the running thread, peak traced memory and the
+    bytes reported through `add_bytes`. While disabled, `stage` returns a
+    shared no-op context manager and `add_bytes` returns at once, so the
+    instrumentation can stay in the code. Memory is traced with
+    tracemalloc, which is process-wide: stages running concurrently in
+    several threads share one peak.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._started = time.time()
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+            self._started = time.time()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _record(self, key, wall, cpu, transferred, peak_memory):
+        with self._lock:
+            totals = self._totals.setdefault(key, dict.fromkeys(metric_names, 0))
+            totals['calls'] += 1
+            totals['wall_seconds'] += wall
+            totals['cpu_seconds'] += cpu
+            totals['bytes'] += transferred
+            totals['peak_memory_bytes'] = max(totals['peak_memory_bytes'], peak_memory)
+
+    def merge(self, stages):
+        # Fold report()['stages'] entries from another profiler (e.g. a worker process) into these totals
+        with self._lock:
+            for entry in stages:
+                totals = self._totals.setdefault((entry['stage'], entry['coin']), dict.fromkeys(metric_names, 0))
+                for metric in metric_names:
+                    if metric == 'peak_memory_bytes':
+                        totals[metric] = max(totals[metric], entry[metric])
+                    else:
+                        totals[metric] += entry[metric]
+
+    def stage(self, name, coin=None):
+        if not self.enabled:
+            return _disabled
+        return _Stage(self, name, coin)
+
+    def add_bytes(self, count):
+        # Bytes sent or received by the innermost stage of the calling thread
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            stack[-1].bytes += count
+
+    def report(self):
+        with self._lock:
+            stages = [
+                {'stage': name, 'coin': coin, **totals}
+                for (name, coin), totals in sorted(self._totals.items())
+            ]
+        return {'started': self._started, 'stages': stages}
+
+    def to_json(self, path=None):
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, prefix='crypto_pipeline_stage'):
+        # Text exposition format: one sample per metric, stage and coin
+        stages = self.report()['stages']
+        lines = []
+        for metric in metric_names:
+            kind = 'counter' if metric != 'peak_memory_bytes' else 'gauge'
+            lines.append(f'# TYPE {prefix}_{metric} {kind}')
+            for entry in stages:
+                lines.append(f'{prefix}_{metric}{{stage="{entry["stage"]}",coin="{entry["coin"]}"}} {entry[metric]}')
+        return '\n'.join(lines) + '\n'
+
+
+def compare_reports(baseline, current, metric='wall_seconds', tolerance=0.2):
+    # Stages of `current` whose `metric` grew by more than `tolerance`
+    # (a fraction) over the same stage and coin in `baseline`
+    before = {(entry['stage'], entry['coin']): entry[metric] for entry in baseline['stages']}
+    regressions = []
+    for entry in current['stages']:
+        old = before.get((entry['stage'], entry['coin']))
+        if old and entry[metric] > old * (1 + tolerance):
+            regressions.append({'stage': entry['stage'], 'coin': entry['coin'], 'before': old, 'after': entry[metric]})
+    return regressions
+
+
+profiler = Profiler(enabled=os.environ.get(env_var, '') not in ('', '0'))
+stage = profiler.stage
+add_bytes = profiler.add_bytes
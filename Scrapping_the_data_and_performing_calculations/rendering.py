@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from profiler import profiler, stage
+
+# Chart size in inches and resolution; width * dpi is the number of pixel columns
+figsize = (10, 5)
+dpi = 100
+
+
+def decimate_minmax(x, y, n_buckets):
+    """Keep only the minimum and maximum point of each of `n_buckets` runs.
+
+    With one bucket per pixel column the drawn line looks the same as the
+    full series, while at most 2 * n_buckets points are left to draw.
+    Points are returned in their original order; NaNs are dropped.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    if y.size <= 2 * n_buckets:
+        return x, y
+    size = -(-y.size // n_buckets)
+    padded = np.concatenate([y, np.full(size * n_buckets - y.size, np.nan)]).reshape(n_buckets, size)
+    # The last buckets can be all padding; give them a real value to find
+    padded[np.isnan(padded).all(axis=1), 0] = y[-1]
+    offsets = np.arange(n_buckets)[:, None] * size
+    index = np.sort(np.stack([np.nanargmin(padded, axis=1), np.nanargmax(padded, axis=1)], axis=1), axis=1)
+    index = np.unique(np.minimum(index + offsets, y.size - 1))
+    return x[index], y[index]
+
+
+def _draw(coin, price_points, volume_points, fmt):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(*price_points, label=coin.capitalize())
+    ax.set_title('Cryptocurrency Price and Volume')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price (USD)')
+    lines = ax.get_lines()
+    if volume_points is not None:
+        # Volume is orders of magnitude larger than price, so give it its own axis
+        volume_ax = ax.twinx()
+        volume_ax.plot(*volume_points, color='tab:orange', label=f'{coin.capitalize()} Volume')
+        volume_ax.set_ylabel('Volume (USD)')
+        lines += volume_ax.get_lines()
+    ax.legend(lines, [line.get_label() for line in lines])
+    fig.autofmt_xdate(rotation=45)
+    buffer = BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _profiled_draw(coin, price_points, volume_points, fmt):
+    # _draw in a worker process, timed as the coin's plot stage; returns the
+    # image and the stage entries for the parent to merge
+    profiler.enable()
+    profiler.reset()
+    with stage('plot', coin):
+        image = _draw(coin, price_points, volume_points, fmt)
+    return image, profiler.report()['stages']
+
+
+def _decimated(df, column):
+    return decimate_minmax(df['timestamp'].to_numpy(), df[column].to_numpy(), figsize[0] * dpi)
+
+
+def render_coin_chart(coin, df, volume_df=None, fmt='png'):
+    # Draws on a Figure of its own, so nothing accumulates in pyplot's global state
+    volume_points = None if volume_df is None else _decimated(volume_df, 'volume')
+    return _draw(coin, _decimated(df, 'price'), volume_points, fmt)
+
+
+def render_charts(charts, max_workers=None, fmt='png'):
+    """Render many coins' charts in parallel worker processes.
+
+    `charts` maps each coin to a `(df, volume_df)` pair. Series are
+    decimated before they are sent to the workers, so only a few thousand
+    points per chart cross the process boundary. Returns a dict mapping
+    each coin to its image bytes. With profiling on, every chart is
+    timed as a plot stage of its coin.
+    """
+    jobs = {
+        coin: (_decimated(df, 'price'), None if volume_df is None else _decimated(volume_df, 'volume'))
+        for coin, (df, volume_df) in charts.items()
+    }
+    draw = _profiled_draw if profiler.enabled else _draw
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            coin: executor.submit(draw, coin, price_points, volume_points, fmt)
+            for coin, (price_points, volume_points) in jobs.items()
+        }
+        images = {coin: future.result() for coin, future in futures.items()}
+    if profiler.enabled:
+        for coin, (image, stages) in images.items():
+            profiler.merge(stages)
+            images[coin] = image
+    return images
@@ -0,0 +1,161 @@
+import argparse
+import threading
+import time
+
+import pandas as pd
+
+from correlation import correlation_matrix
+from parallel_analytics import analyze_coins, default_steps
+
+# Trailing windows (in days) every coin's stats and the correlations are indexed for;
+# None means everything that was fetched
+default_windows = {'7D': 7, '30D': 30, '90D': 90, 'all': None}
+
+
+def _trailing(df, days, end=None):
+    # The rows of a clean_data frame in the `days` days up to `end` (its last day by default)
+    if days is None or df.empty:
+        return df
+    end = df['timestamp'].iloc[-1] if end is None else end
+    return df[df['timestamp'] > end - pd.Timedelta(days=days)]
+
+
+def _no_stats(df):
+    # analyze_coins only cleans here; the per-window stats come from precompute
+    return {}
+
+
+class ReportIndex:
+    """Precomputed per-coin, per-window stats and correlation matrices.
+
+    `refresh(histories)` cleans the coins that have new points (in a
+    process pool, through analyze_coins), drops every index entry they
+    make stale and, unless told not to, recomputes the index at once.
+    Queries are then dictionary lookups; an entry that has been
+    invalidated but not recomputed yet is rebuilt from the cleaned frames
+    on first use, never from the upstream API.
+    """
+
+    def __init__(self, windows=default_windows, clean=None, stats=None):
+        self.windows = dict(windows)
+        if clean is None or stats is None:
+            default_clean, default_stats = default_steps()
+            clean, stats = clean or default_clean, stats or default_stats
+        self.clean = clean
+        self.get_stats = stats
+        self.refreshed_at = None
+        self._frames = {}
+        self._versions = {}
+        self._stats = {}
+        self._correlations = {}
+        self._lock = threading.RLock()
+
+    @property
+    def coins(self):
+        return list(self._frames)
+
+    def _check_window(self, window):
+        if window not in self.windows:
+            raise ValueError(f"Unknown window '{window}', expected one of {', '.join(self.windows)}.")
+
+    def refresh(self, histories, precompute=True, max_workers=None):
+        # histories maps each coin to its (prices_df, volume_df) pair; returns the coins that changed
+        changed = {}
+        for coin, (prices_df, volume_df) in histories.items():
+            if prices_df.empty or volume_df.empty:
+                continue
+            version = (len(prices_df), prices_df['timestamp'].iloc[-1])
+            if self._versions.get(coin) != version:
+                changed[coin] = (prices_df, volume_df)
+        if changed:
+            _, frames = analyze_coins(changed, max_workers, self.clean, _no_stats)
+            with self._lock:
+                self.invalidate(frames)
+                for coin, df in frames.items():
+                    self._frames[coin] = df
+                    self._versions[coin] = (len(changed[coin][0]), changed[coin][0]['timestamp'].iloc[-1])
+        self.refreshed_at = time.time()
+        if precompute:
+            self.precompute()
+        return list(changed)
+
+    def refresh_from_cache(self, cache, coins, days=90, **kwargs):
+        # Refresh from the points already in a MarketChartCache, without any request
+        since_ms = int((time.time() - days * 24 * 3600) * 1000)
+        return self.refresh({coin: cache.load(coin, since_ms) for coin in coins}, **kwargs)
+
+    def invalidate(self, coins=None):
+        # Drop the entries of `coins` (all coins by default); every
+        # correlation matrix involves every coin, so they all go
+        with self._lock:
+            if coins is None:
+                self._stats.clear()
+            else:
+                coins = set(coins)
+                for key in [key for key in self._stats if key[0] in coins]:
+                    del self._stats[key]
+            self._correlations.clear()
+
+    def precompute(self, on=('price',)):
+        with self._lock:
+            for coin in self._frames:
+                for window in self.windows:
+                    self.stats(coin, window)
+            for window in self.windows:
+                for series in on:
+                    self.correlation_matrix(window, series)
+
+    def stats(self, coin, window='30D'):
+        self._check_window(window)
+        with self._lock:
+            key = (coin, window)
+            if key not in self._stats:
+                df = _trailing(self._frames[coin], self.windows[window])
+                stats = self.get_stats(df)
+                outliers = stats.pop('outliers')
+                stats['days'] = len(df)
+                stats['outliers'] = [t.isoformat() for t in outliers['timestamp']]
+                self._stats[key] = stats
+            return self._stats[key]
+
+    def summary(self, window='30D'):
+        # The stats of every coin over `window`, one row per coin
+        rows = {coin: self.stats(coin, window) for coin in self.coins}
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def correlation_matrix(self, window='30D', on='price'):
+        self._check_window(window)
+        with self._lock:
+            key = (window, on)
+            if key not in self._correlations:
+                end = max(df['timestamp'].iloc[-1] for df in self._frames.values())
+                frames = {coin: _trailing(df, self.windows[window], end) for coin, df in self._frames.items()}
+                self._correlations[key] = correlation_matrix(frames, on=on)
+            return self._correlations[key]
+
+    def correlation(self, coin, other, window='30D', on='price'):
+        return self.correlation_matrix(window, on).loc[coin, other]
+
+    def top_correlated(self, coin, k=5, window='30D', on='price'):
+        # The k coins most correlated with `coin`, strongest first
+        column = self.correlation_matrix(window, on)[coin].drop(coin).dropna()
+        return column.sort_values(ascending=False, kind='stable').head(k)
+
+
+if __name__ == '__main__':
+    from market_cache import MarketChartCache
+
+    parser = argparse.ArgumentParser(description='Answer stats and correlation questions from the local cache.')
+    parser.add_argument('coins', nargs='+')
+    parser.add_argument('--window', default='30D', choices=list(default_windows))
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+    cache = MarketChartCache()
+    index = ReportIndex()
+    index.refresh_from_cache(cache, args.coins)
+    cache.close()
+    print(index.summary(args.window).drop(columns='outliers').to_string())
+    if len(index.coins) > 1:
+        for coin in index.coins:
+            top = ', '.join(f'{other} ({corr:.2f})' for other, corr in index.top_correlated(coin, args.top, args.window).items())
+            print(f'Most correlated with {coin}: {top}')
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+default_resolutions = ('1h', '1D', '1W')
+
+
+def _fixed_length(resolution):
+    # Length of a fixed-size resolution, or None for (Monday-based) weeks
+    offset = pd.tseries.frequencies.to_offset(resolution)
+    if isinstance(offset, pd.offsets.Week):
+        if offset.n != 1:
+            raise ValueError(f"Unsupported resolution '{resolution}', only single weeks are supported.")
+        return None
+    try:
+        return pd.Timedelta(resolution)
+    except ValueError:
+        raise ValueError(f"Unsupported resolution '{resolution}', expected a fixed frequency or '1W'.") from None
+
+
+def _bucket_starts(timestamps, resolution):
+    # Start of the bar each timestamp falls in. Fixed-length resolutions are
+    # floored from the epoch; weekly bars start on Mondays.
+    length = _fixed_length(resolution)
+    if length is not None:
+        return timestamps.floor(length)
+    days = timestamps.normalize()
+    return days - pd.to_timedelta(days.weekday, unit='D')
+
+
+def _nests(finer, coarser):
+    finer = _fixed_length(finer)
+    coarser = _fixed_length(coarser)
+    if finer is None:
+        return False
+    if coarser is None:
+        return pd.Timedelta(days=1) % finer == pd.Timedelta(0)
+    return coarser > finer and coarser % finer == pd.Timedelta(0)
+
+
+def _aggregate(timestamps, opens, highs, lows, closes, sums, counts, volumes, resolution):
+    labels = _bucket_starts(pd.DatetimeIndex(timestamps), resolution)
+    if len(labels) == 0:
+        return {key: np.empty(0) for key in ('open', 'high', 'low', 'close', 'sum', 'count', 'volume')} | {
+            'timestamp': labels
+        }
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends = np.r_[starts[1:], len(labels)] - 1
+    return {
+        'timestamp': labels[starts],
+        'open': opens[starts],
+        'high': np.maximum.reduceat(highs, starts),
+        'low': np.minimum.reduceat(lows, starts),
+        'close': closes[ends],
+        'sum': np.add.reduceat(sums, starts),
+        'count': np.add.reduceat(counts, starts),
+        'volume': np.add.reduceat(volumes, starts),
+    }
+
+
+def _to_frame(level):
+    close = level['close']
+    return pd.DataFrame(
+        {
+            'timestamp': level['timestamp'],
+            'open': level['open'],
+            'high': level['high'],
+            'low': level['low'],
+            'close': close,
+            'mean': level['sum'] / level['count'],
+            'volume': level['volume'],
+            'count': level['count'],
+            'log_return': np.r_[np.nan, np.diff(np.log(close))],
+        }
+    )
+
+
+def multi_resolution_bars(prices_df, volume_df, resolutions=default_resolutions):
+    """OHLC, mean-price and volume-sum bars at several resolutions.
+
+    The raw series is merged and sorted once and only the finest resolution
+    is built from it; every coarser level is aggregated from the level
+    before it. `resolutions` go from finest to coarsest and each must fit a
+    whole number of times into the next. Returns a dict mapping each
+    resolution to its bars, with the close-to-close log return of each bar.
+    """
+    for finer, coarser in zip(resolutions, resolutions[1:]):
+        if not _nests(finer, coarser):
+            raise ValueError(f"'{finer}' bars cannot be combined into '{coarser}' bars.")
+    df = pd.merge(prices_df, volume_df, on='timestamp').sort_values('timestamp', kind='stable')
+    df = df.dropna(subset=['price'])
+    price = df['price'].to_numpy(dtype=float)
+    volume = np.nan_to_num(df['volume'].to_numpy(dtype=float))
+    level = _aggregate(
+        df['timestamp'].to_numpy(), price, price, price, price, price, np.ones(price.size), volume, resolutions[0]
+    )
+    bars = {resolutions[0]: _to_frame(level)}
+    for resolution in resolutions[1:]:
+        level = _aggregate(
+            level['timestamp'], level['open'], level['high'], level['low'], level['close'],
+            level['sum'], level['count'], level['volume'], resolution,
+        )
+        bars[resolution] = _to_frame(level)
+    return bars
+
+
+def timeframe_volatility(bars):
+    # Standard deviation of the bar-to-bar log returns at each resolution
+    return {resolution: frame['log_return'].std() for resolution, frame in bars.items()}
@@ -0,0 +1,24 @@
+import warnings
+
+import numpy as np
+
+
+def column_centres(values):
+    """Mean of each column of a 2-D (time, coin) array, ignoring NaNs (0 for
+    an all-NaN column). Subtracting it before summing squares or products
+    keeps those sums well conditioned for prices far from zero."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nan_to_num(np.nanmean(values, axis=0))
+
+
+def trailing_sums(values, window, lag=0):
+    """Sum over the `window` rows ending `lag` rows before each row of a
+    2-D (time, coin) array; fewer rows near the start. O(n) per column
+    through one cumulative sum. `values` must not hold NaNs."""
+    values = np.asarray(values, dtype=float)
+    # padded[k] is the sum of the first k rows
+    padded = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    end = np.clip(np.arange(1, len(values) + 1) - lag, 0, len(values))
+    start = np.clip(end - window, 0, None)
+    return padded[end] - padded[start]
@@ -1,67 +1,94 @@
+import argparse
+
 import pandas as pd
 import requests
-import matplotlib.pyplot as plt
-import statistics
+
+from coingecko_client import CoinGeckoClient
+from correlation import correlation_matrix
+from fetcher import get_historical_data_batch
+from indicators import IndicatorEngine
+from ingest import align_points, parse_market_chart_body, split_frame
+from live_poller import fetch_simple_prices
+from market_cache import MarketChartCache
+from outliers import detect_outliers
+from parallel_analytics import analyze_coins
+from profiler import profiler, stage
+from resampling import multi_resolution_bars, timeframe_volatility
+from streaming_stats import StatsAccumulator
 
 # Define the base URL for the CoinGecko API
 base_url = 'https://api.coingecko.com/api/v3/'
 
 def get_historical_data(coin):
     url = f'{base_url}coins/{coin}/market_chart?vs_currency=usd&days=30'
-    response = requests.get(url)
+    response = requests.get(url, timeout=30)
     if response.status_code != 200:
-        return None
-    data = response.json()
-    prices_df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
-    prices_df['timestamp'] = pd.to_datetime(prices_df['timestamp'], unit='ms')
-    volume_df = pd.DataFrame(data['total_volumes'], columns=['timestamp', 'volume'])
-    volume_df['timestamp'] = pd.to_datetime(volume_df['timestamp'], unit='ms')
-    return prices_df, volume_df
+        print(f'Error: Could not retrieve data for {coin}. Status code: {response.status_code}.')
+        return pd.DataFrame(), pd.DataFrame()
+    return split_frame(parse_market_chart_body(response.content))
 
 
-def clean_data(prices_df, volume_df):
-    df = pd.merge(prices_df, volume_df, on='timestamp')
+def clean_data(prices_df, volume_df=None):
+    # Without volume_df, prices_df is already an aligned frame (e.g. with market caps)
+    df = prices_df if volume_df is None else align_points(prices_df, volume_df)
     df = df.set_index('timestamp').resample('D').mean().reset_index()
     return df
 
 
 def get_stats(df):
-    stats = {}
-    q1 = df['price'].quantile(0.25)
-    q3 = df['price'].quantile(0.75)
-    iqr = q3 - q1
-    lower_bound = q1 - 1.5 * iqr
-    upper_bound = q3 + 1.5 * iqr
-    outliers = df[(df['price'] < lower_bound) | (df['price'] > upper_bound)]
-    stats['outliers'] = outliers
-    stats['avg_price'] = df['price'].mean()
-    stats['std_dev_price'] = statistics.stdev(df['price'])
-    stats['min_price'] = df['price'].min()
-    stats['max_price'] = df['price'].max()
-    stats['avg_volume'] = df['volume'].mean()
-    stats['std_dev_volume'] = statistics.stdev(df['volume'])
-    stats['min_volume'] = df['volume'].min()
-    stats['max_volume'] = df['volume'].max()
+    # One accumulation pass per column; the IQR bounds come from its quantiles
+    accumulator = StatsAccumulator().update(df)
+    stats = accumulator.summary()
+    lower_bound, upper_bound = accumulator.outlier_bounds('price')
+    stats['outliers'] = df[(df['price'] < lower_bound) | (df['price'] > upper_bound)]
     return stats
 
 
 def plot_prices(df, coin):
+    # pyplot is only imported when something is plotted
+    import matplotlib.pyplot as plt
+
     plt.plot(df['timestamp'], df['price'], label=coin.capitalize())
 
 
 def plot_volume(volume_df, coin):
+    import matplotlib.pyplot as plt
+
     plt.plot(volume_df['timestamp'], volume_df['volume'], label=f'{coin.capitalize()} Volume')
 
 
 def main():
+    import matplotlib.pyplot as plt
+
     coins = ['bitcoin', 'ethereum']
+    client = CoinGeckoClient()
+    cache = MarketChartCache()
+    histories = get_historical_data_batch(coins, session=client, cache=cache)
+    # Rolling z-score of the raw (hourly) log returns, where daily averaging can't hide spikes
+    tick_outliers = detect_outliers(
+        {coin: prices_df for coin, (prices_df, volume_df) in histories.items() if not prices_df.empty},
+        on='log_returns',
+    )
+    # Current prices of every coin in one batched request
+    try:
+        current_prices = fetch_simple_prices(client, coins)
+    except requests.RequestException:
+        current_prices = {}
+    # Clean and summarise every coin at once, spread over the available cores
+    with stage('analytics'):
+        summary, frames = analyze_coins(histories, clean=clean_data, stats=get_stats)
+    # Moving averages, returns and drawdowns of every coin in one vectorized pass
+    indicators = IndicatorEngine()
+    if frames:
+        indicators.compute(frames)
+    trends = indicators.summary()
     for coin in coins:
-        prices_df, volume_df = get_historical_data(coin)
-        if prices_df is None or volume_df is None:
+        prices_df, volume_df = histories[coin]
+        if coin not in frames:
             print(f'Error: Could not retrieve data for {coin}.')
             continue
-        df = clean_data(prices_df, volume_df)
-        stats = get_stats(df)
+        df = frames[coin]
+        stats = summary.loc[coin]
         print(f"Stats for {coin.capitalize()} (past 30 days):\n")
         print(f"Number of data points: {len(df)}\n")
         print(f"Average Price: {stats['avg_price']:.2f}")
@@ -72,33 +99,46 @@ def main():
         print(f"Minimum Volume: {stats['min_volume']:.2f}")
         print(f"Maximum Volume: {stats['max_volume']:.2f}")
         print(f"Standard Deviation of Volume: {stats['std_dev_volume']:.2f}\n")
-        print(f"Outliers: {len(stats['outliers'])}\n")
-        plot_prices(df, coin)
-        plot_volume(volume_df, coin)
+        print(f"Outliers: {int(stats['outliers'])}")
+        print(f"Outliers in the hourly log returns (rolling z-score): {len(tick_outliers[coin])}\n")
+        bars = multi_resolution_bars(prices_df, volume_df)
+        for resolution, volatility in timeframe_volatility(bars).items():
+            print(f"Volatility of {resolution} log returns: {volatility:.4f}")
+        trend = trends.loc[coin]
+        print(f"Return over the period: {trend['total_return']:+.2%}")
+        print(f"Maximum drawdown: {trend['max_drawdown']:.2%}")
+        print(f"7-day / 30-day moving average: {trend['sma_7']:.2f} / {trend['sma_30']:.2f}")
+        print()
+        with stage('plot', coin):
+            plot_prices(df, coin)
+            plot_volume(volume_df, coin)
         plt.xlim(df['timestamp'].min(), df['timestamp'].max())
 
-        # Fetch the current price of the coin
-        current_price_url = f'https://api.coingecko.com/api/v3/simple/price?ids={coin}&vs_currencies=usd'
-        response = requests.get(current_price_url)
-        if response.status_code != 200:
+        if coin not in current_prices:
             print(f'Error: Could not retrieve current price for {coin}.')
             continue
-        current_price = response.json()[coin]['usd']
-        print(f"Current price of {coin.capitalize()}: ${current_price:,.2f}\n")
-
-    # Calculate and print correlation coefficient
-    btc_prices_df, btc_volume_df = get_historical_data('bitcoin')
-    eth_prices_df, eth_volume_df = get_historical_data('ethereum')
-    btc_df = clean_data(btc_prices_df, btc_volume_df)
-    eth_df = clean_data(eth_prices_df, eth_volume_df)
-    corr = btc_df['price'].corr(eth_df['price'])
-    print(f"Correlation coefficient between Bitcoin and Ethereum: {corr:.2f}")
-    
+        print(f"Current price of {coin.capitalize()}: ${current_prices[coin]:,.2f}\n")
+
+    # Calculate and print correlation coefficient, when both coins were fetched
+    if 'bitcoin' in frames and 'ethereum' in frames:
+        corr = correlation_matrix({'bitcoin': frames['bitcoin'], 'ethereum': frames['ethereum']}).loc['bitcoin', 'ethereum']
+        print(f"Correlation coefficient between Bitcoin and Ethereum: {corr:.2f}")
+    cache_stats = cache.stats()
+    print(f"Cache hits: {cache_stats['hits']}, misses: {cache_stats['misses']}")
+    cache.close()
+    client.close()
+    if profiler.enabled:
+        print(profiler.to_json())
+
     plt.xticks(rotation=45)
     plt.legend()
     plt.show()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', action='store_true', help='print per-stage timings (or set CRYPTO_PIPELINE_PROFILE=1)')
+    if parser.parse_args().profile:
+        profiler.enable()
     main()
 
 # output:
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+class ColumnAccumulator:
+    """Running count, mean, variance, min, max and quantiles of one column.
+
+    The moments are updated chunk by chunk with Welford's method (Chan et
+    al.'s pairwise form, so two accumulators can also be merged) and the
+    quantiles come from a merging t-digest holding at most about
+    `compression / 2` centroids. Until more than `compression` values have
+    been seen every value is its own centroid and the quantiles are exact.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        chunk = ColumnAccumulator(self.compression)
+        chunk.count = values.size
+        chunk.mean = values.mean()
+        chunk.m2 = ((values - chunk.mean) ** 2).sum()
+        chunk.min = values.min()
+        chunk.max = values.max()
+        chunk._means = np.sort(values)
+        chunk._weights = np.ones(values.size)
+        chunk._compress()
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            self._means, self._weights = other._means, other._weights
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        means = np.concatenate([self._means, other._means])
+        order = np.argsort(means, kind='stable')
+        self._means = means[order]
+        self._weights = np.concatenate([self._weights, other._weights])[order]
+        self._compress()
+        return self
+
+    def _compress(self):
+        if self._means.size <= self.compression:
+            return
+        # Group neighbouring centroids that fall in the same unit of the
+        # t-digest k1 scale; the scale is steep near q=0 and q=1 so the
+        # tails keep small centroids and stay accurate.
+        total = self._weights.sum()
+        q = (np.cumsum(self._weights) - self._weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        group = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        weights = np.add.reduceat(self._weights, starts)
+        self._means = np.add.reduceat(self._means * self._weights, starts) / weights
+        self._weights = weights
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std_dev(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        if self._weights.size == self.count:
+            # Every value is still its own centroid
+            return np.quantile(self._means, q)
+        centres = np.cumsum(self._weights) - self._weights / 2
+        xp = np.r_[0.0, centres, self.count]
+        fp = np.r_[self.min, self._means, self.max]
+        return np.interp(np.asarray(q) * self.count, xp, fp)
+
+
+class StatsAccumulator:
+    # One ColumnAccumulator per column, fed from DataFrames (or chunks of one)
+
+    def __init__(self, columns=('price', 'volume'), compression=200):
+        self.columns = columns
+        self.accumulators = {column: ColumnAccumulator(compression) for column in columns}
+
+    def update(self, df):
+        for column, accumulator in self.accumulators.items():
+            accumulator.update(df[column].to_numpy(dtype=float))
+        return self
+
+    def merge(self, other):
+        for column, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[column])
+        return self
+
+    def outlier_bounds(self, column='price'):
+        accumulator = self.accumulators[column]
+        q1, q3 = accumulator.quantile([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    def summary(self):
+        stats = {}
+        for column, accumulator in self.accumulators.items():
+            stats[f'avg_{column}'] = accumulator.mean if accumulator.count else np.nan
+            stats[f'std_dev_{column}'] = accumulator.std_dev
+            stats[f'min_{column}'] = accumulator.min
+            stats[f'max_{column}'] = accumulator.max
+        return stats
+
+
+def stats_from_chunks(chunks, columns=('price', 'volume'), compression=200):
+    # Accumulate over an iterable of DataFrame chunks (e.g. read_csv(chunksize=...))
+    accumulator = StatsAccumulator(columns, compression)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
@@ -0,0 +1,94 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ingest import align_points
+
+
+class TimeSeriesStore:
+    """Price and volume points of many coins in three shared contiguous arrays.
+
+    Timestamps are int64 epoch milliseconds; the points of coin i sit at
+    positions offsets[i]:offsets[i + 1] of every array. `frame`,
+    `prices_df` and `volume_df` wrap those slices in DataFrames without
+    copying them. `save` writes the arrays as .npy files and `load` can
+    memory-map them, so several processes can share one copy.
+    """
+
+    def __init__(self, coins, offsets, timestamps, prices, volumes):
+        self.coins = list(coins)
+        self.offsets = offsets
+        self.timestamps = timestamps
+        self.prices = prices
+        self.volumes = volumes
+        self._positions = {coin: i for i, coin in enumerate(self.coins)}
+
+    @classmethod
+    def from_frames(cls, histories, dtype=np.float64):
+        # histories maps each coin to its (prices_df, volume_df) pair
+        coins, merged = [], []
+        for coin, (prices_df, volume_df) in histories.items():
+            if prices_df.empty or volume_df.empty:
+                continue
+            coins.append(coin)
+            merged.append(align_points(prices_df, volume_df).sort_values('timestamp', kind='stable'))
+        lengths = [len(df) for df in merged]
+        offsets = np.zeros(len(merged) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        timestamps = np.empty(offsets[-1], dtype=np.int64)
+        prices = np.empty(offsets[-1], dtype=dtype)
+        volumes = np.empty(offsets[-1], dtype=dtype)
+        for i, df in enumerate(merged):
+            window = slice(offsets[i], offsets[i + 1])
+            timestamps[window] = df['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+            prices[window] = df['price'].to_numpy()
+            volumes[window] = df['volume'].to_numpy()
+        return cls(coins, offsets, timestamps, prices, volumes)
+
+    def __len__(self):
+        return len(self.coins)
+
+    def __contains__(self, coin):
+        return coin in self._positions
+
+    def arrays(self, coin):
+        # Views, not copies, of one coin's timestamps, prices and volumes
+        i = self._positions[coin]
+        window = slice(self.offsets[i], self.offsets[i + 1])
+        return self.timestamps[window], self.prices[window], self.volumes[window]
+
+    def _column_frame(self, coin, **columns):
+        timestamps = self.arrays(coin)[0]
+        data = {'timestamp': timestamps.view('datetime64[ms]')}
+        data.update(columns)
+        return pd.DataFrame(data, copy=False)
+
+    def frame(self, coin):
+        _, prices, volumes = self.arrays(coin)
+        return self._column_frame(coin, price=prices, volume=volumes)
+
+    def prices_df(self, coin):
+        return self._column_frame(coin, price=self.arrays(coin)[1])
+
+    def volume_df(self, coin):
+        return self._column_frame(coin, volume=self.arrays(coin)[2])
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ('offsets', 'timestamps', 'prices', 'volumes'):
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'coins.json'), 'w') as f:
+            json.dump(self.coins, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(directory, 'coins.json')) as f:
+            coins = json.load(f)
+        arrays = [
+            np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in ('offsets', 'timestamps', 'prices', 'volumes')
+        ]
+        return cls(coins, *arrays)
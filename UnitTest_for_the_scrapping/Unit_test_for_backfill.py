@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from backfill import backfill, plan_chunks
+from stub_coingecko_server import StubCoinGeckoServer, fast_client
+
+HOUR_MS = 3600 * 1000
+
+
+def range_route(fail_from=()):
+    # Hourly points covering [from, to] inclusive, like market_chart/range
+    def route(query):
+        lo, hi = int(query["from"]), int(query["to"])
+        if lo in fail_from:
+            return (500, {}, {"error": "boom"})
+        first = -(-lo * 1000 // HOUR_MS) * HOUR_MS
+        timestamps = range(first, hi * 1000 + 1, HOUR_MS)
+        return {
+            "prices": [[t, t / HOUR_MS] for t in timestamps],
+            "market_caps": [[t, 1.0] for t in timestamps],
+            "total_volumes": [[t, 2.0] for t in timestamps],
+        }
+
+    return route
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoints = os.path.join(self.tmpdir.name, "checkpoints")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_plan_chunks_covers_the_range(self):
+        chunks = plan_chunks("2021-01-01", "2023-01-01", chunk_days=90)
+        self.assertEqual(len(chunks), 9)
+        self.assertEqual(chunks[0][1], chunks[1][0])
+        self.assertEqual(chunks[-1][1], 1672531200)
+
+    def test_stitches_a_sorted_deduplicated_series(self):
+        routes = {f"/api/v3/coins/{coin}/market_chart/range": range_route() for coin in ("bitcoin", "ethereum")}
+        with StubCoinGeckoServer(routes) as server:
+            result = backfill(
+                ["bitcoin", "ethereum"], "2022-01-01", "2022-03-01", client=fast_client(),
+                base_url=server.base_url, chunk_days=7, checkpoint_dir=self.checkpoints,
+            )
+        self.assertEqual(len(server.requests), 2 * 9)
+        for prices_df, volume_df in result.values():
+            # Every hour from start to end exactly once, although chunk edges overlap
+            self.assertEqual(len(prices_df), 59 * 24 + 1)
+            self.assertTrue(prices_df["timestamp"].is_monotonic_increasing)
+            self.assertTrue(prices_df["timestamp"].is_unique)
+            self.assertTrue(np.all(np.diff(prices_df["price"]) == 1))
+            self.assertEqual(len(volume_df), len(prices_df))
+
+    def test_interrupted_backfill_resumes(self):
+        chunks = plan_chunks("2022-01-01", "2022-03-01", chunk_days=7)
+        failing = {chunks[2][0], chunks[5][0]}
+        path = "/api/v3/coins/bitcoin/market_chart/range"
+        with StubCoinGeckoServer({path: range_route(fail_from=failing)}) as server:
+            first = backfill(["bitcoin"], "2022-01-01", "2022-03-01", client=fast_client(),
+                             base_url=server.base_url, chunk_days=7, checkpoint_dir=self.checkpoints)
+        self.assertEqual(first, {})
+        with StubCoinGeckoServer({path: range_route()}) as server:
+            second = backfill(["bitcoin"], "2022-01-01", "2022-03-01", client=fast_client(),
+                              base_url=server.base_url, chunk_days=7, checkpoint_dir=self.checkpoints)
+        # Only the two chunks that failed are fetched again
+        self.assertEqual(sorted(int(q["from"]) for _, q in server.requests), sorted(failing))
+        self.assertEqual(len(second["bitcoin"][0]), 59 * 24 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
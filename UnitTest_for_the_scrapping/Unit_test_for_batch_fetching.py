@@ -0,0 +1,55 @@
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from fetcher import get_historical_data_batch
+from stub_coingecko_server import StubCoinGeckoServer, fast_client, market_chart_payload
+
+
+class TestBatchFetching(unittest.TestCase):
+    def test_returns_frames_for_every_coin(self):
+        coins = [f"coin-{i}" for i in range(10)]
+        routes = {
+            f"/api/v3/coins/{coin}/market_chart": market_chart_payload(base_price=i)
+            for i, coin in enumerate(coins)
+        }
+        with StubCoinGeckoServer(routes) as server:
+            histories = get_historical_data_batch(coins, session=fast_client(), base_url=server.base_url)
+        self.assertEqual(list(histories), coins)
+        for i, coin in enumerate(coins):
+            prices_df, volume_df = histories[coin]
+            self.assertEqual(list(prices_df.columns), ["timestamp", "price"])
+            self.assertEqual(list(volume_df.columns), ["timestamp", "volume"])
+            self.assertEqual(prices_df["price"].iloc[0], i)
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(prices_df["timestamp"]))
+
+    def test_concurrency_is_capped(self):
+        coins = [f"coin-{i}" for i in range(12)]
+        routes = {f"/api/v3/coins/{coin}/market_chart": market_chart_payload() for coin in coins}
+        with StubCoinGeckoServer(routes, delay=0.05) as server:
+            get_historical_data_batch(coins, max_workers=3, session=fast_client(3), base_url=server.base_url)
+        self.assertEqual(len(server.requests), 12)
+        self.assertGreater(server.max_in_flight, 1)
+        self.assertLessEqual(server.max_in_flight, 3)
+
+    def test_failed_coin_returns_empty_frames(self):
+        routes = {"/api/v3/coins/bitcoin/market_chart": market_chart_payload()}
+        with StubCoinGeckoServer(routes) as server:
+            histories = get_historical_data_batch(["bitcoin", "missing"], session=fast_client(), base_url=server.base_url)
+        self.assertFalse(histories["bitcoin"][0].empty)
+        self.assertTrue(histories["missing"][0].empty)
+        self.assertTrue(histories["missing"][1].empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
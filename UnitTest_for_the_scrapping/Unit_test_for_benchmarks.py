@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Benchmarks_for_the_pipeline",
+    ),
+)
+from benchmark_pipeline import compare_results, main, run_case
+from fetcher import fetch_market_chart
+from synthetic_market_chart import PayloadSession, synthetic_market_chart, synthetic_universe
+
+
+class TestSyntheticMarketChart(unittest.TestCase):
+    def test_payload_has_the_coingecko_shape(self):
+        payload = synthetic_market_chart(500, seed=3)
+        self.assertEqual(set(payload), {"prices", "market_caps", "total_volumes"})
+        for key, points in payload.items():
+            self.assertEqual(len(points), 500)
+            self.assertEqual(len(points[0]), 2)
+        timestamps = np.array(payload["prices"])[:, 0]
+        self.assertTrue((np.diff(timestamps) > 0).all())
+        self.assertEqual(payload, synthetic_market_chart(500, seed=3))
+        self.assertNotEqual(payload["prices"], synthetic_market_chart(500, seed=4)["prices"])
+
+    def test_payload_session_serves_coins_offline(self):
+        session = PayloadSession(synthetic_universe(2, 100))
+        base_url = "http://benchmark.invalid/api/v3/"
+        prices_df, volume_df = fetch_market_chart(session, "coin-1", base_url)
+        self.assertEqual(len(prices_df), 100)
+        self.assertEqual(len(volume_df), 100)
+        prices_df, _ = fetch_market_chart(session, "missing", base_url)
+        self.assertTrue(prices_df.empty)
+        self.assertEqual(session.requests, 2)
+
+
+class TestBenchmarkPipeline(unittest.TestCase):
+    def test_run_case_times_every_benchmark(self):
+        results = run_case(2_000, 2, repeats=1)
+        self.assertEqual(
+            [entry["benchmark"] for entry in results],
+            ["parse", "clean", "stats", "correlation", "plot", "render"],
+        )
+        for entry in results:
+            self.assertEqual(entry["case"], "2000x2")
+            self.assertGreater(entry["best_seconds"], 0)
+        # A single coin has nothing to correlate with
+        self.assertNotIn("correlation", [entry["benchmark"] for entry in run_case(100, 1, 1, only=("clean", "correlation"))])
+
+    def test_results_are_saved_and_compared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "run.json")
+            report = main(["--case", "1000x2", "--only", "clean", "stats", "--repeats", "1", "--output", output])
+            with open(output) as f:
+                self.assertEqual(json.load(f)["results"], report["results"])
+        slower = {"results": [dict(entry, best_seconds=entry["best_seconds"] * 2) for entry in report["results"]]}
+        rows = compare_results(report, slower)
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(row["regression"] for row in rows))
+        self.assertFalse(any(row["regression"] for row in compare_results(slower, report)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+calculations_dir = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "Scrapping_the_data_and_performing_calculations",
+)
+sys.path.insert(0, calculations_dir)
+from cli import build_parser, main
+from stub_coingecko_server import StubCoinGeckoServer, market_chart_payload
+
+# Runs the CLI in a fresh interpreter, then reports which heavy modules it loaded
+runner = """
+import sys
+sys.path.insert(0, {path!r})
+import cli
+cli.main(sys.argv[1:])
+heavy = ('pandas', 'matplotlib', 'matplotlib.pyplot', 'boto3')
+print('loaded:', ','.join(name for name in heavy if name in sys.modules))
+"""
+
+
+def price_route(query):
+    return {coin: {query["vs_currencies"]: 100.0 * (i + 1)} for i, coin in enumerate(query["ids"].split(","))}
+
+
+class TestCli(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        routes = {"/api/v3/simple/price": price_route}
+        # The last 30 days, so the cached fetch keeps every point
+        start_ms = (int(time.time()) // 3600 - 24 * 30 + 1) * 3600 * 1000
+        for i, coin in enumerate(("bitcoin", "ethereum")):
+            payload = market_chart_payload(24 * 30, start_ms=start_ms, base_price=100.0 * (i + 1))
+            routes[f"/api/v3/coins/{coin}/market_chart"] = payload
+        cls.server = StubCoinGeckoServer(routes).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__(None, None, None)
+
+    def run_cli(self, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run(
+                [sys.executable, "-c", runner.format(path=os.path.abspath(calculations_dir)),
+                 "--base-url", self.server.base_url, "--import-time", *args],
+                cwd=directory, capture_output=True, text=True, timeout=120,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        output, loaded = result.stdout.rsplit("loaded:", 1)
+        return output, set(filter(None, loaded.strip().split(","))), result.stderr
+
+    def test_price_loads_neither_pandas_nor_matplotlib(self):
+        output, loaded, stderr = self.run_cli("price", "bitcoin", "ethereum")
+        self.assertIn("bitcoin: 100.00 USD", output)
+        self.assertIn("ethereum: 200.00 USD", output)
+        self.assertEqual(loaded, set())
+        self.assertIn("price:", stderr)
+        self.assertIn("ms importing", stderr)
+
+    def test_stats_does_not_load_matplotlib(self):
+        output, loaded, _ = self.run_cli("stats", "bitcoin", "ethereum")
+        self.assertIn("avg_price", output)
+        self.assertIn("bitcoin", output)
+        self.assertIn("ethereum", output)
+        self.assertEqual(loaded, {"pandas"})
+
+    def test_correlate(self):
+        output, _, _ = self.run_cli("correlate", "bitcoin", "ethereum")
+        self.assertIn("1.0", output)
+
+    def test_upload_passes_days_and_base_url(self):
+        script = mock.Mock(bucket_name="default-bucket", base_url="https://api.example/")
+        with mock.patch("cli._load", return_value=script):
+            main(["--base-url", "http://mirror/", "upload", "bitcoin", "--days", "7"])
+            main(["upload", "ethereum", "--bucket", "b"])
+        self.assertEqual(script.main.call_args_list, [
+            mock.call(["bitcoin"], "default-bucket", 7, "http://mirror/"),
+            mock.call(["ethereum"], "b", 30, "https://api.example/"),
+        ])
+
+    def test_subcommands_and_options(self):
+        parser = build_parser()
+        args = parser.parse_args(["plot", "bitcoin", "--output", "out", "--days", "7"])
+        self.assertEqual((args.command, args.coins, args.output, args.days), ("plot", ["bitcoin"], "out", 7))
+        args = parser.parse_args(["upload", "bitcoin", "--bucket", "b"])
+        self.assertEqual(args.bucket, "b")
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["stats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
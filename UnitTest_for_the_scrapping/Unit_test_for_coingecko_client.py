@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+import requests
+
+from coingecko_client import CoinGeckoClient, TokenBucket
+from fetcher import get_historical_data_batch
+from stub_coingecko_server import StubCoinGeckoServer, market_chart_payload
+
+
+def failing_then_ok(failures, payload):
+    # Route answering with each of `failures` in turn, then with `payload`
+    failures = list(failures)
+    lock = threading.Lock()
+
+    def route(query):
+        with lock:
+            return failures.pop(0) if failures else payload
+
+    return route
+
+
+class TestCoinGeckoClient(unittest.TestCase):
+    def test_retries_429_and_honours_retry_after(self):
+        route = failing_then_ok([(429, {"Retry-After": "0.3"}, {"error": "rate limited"})], {"ok": True})
+        with StubCoinGeckoServer({"/api/v3/ping": route}) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10, backoff=0.01)
+            started = time.monotonic()
+            response = client.get(f"{server.base_url}ping")
+            elapsed = time.monotonic() - started
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(client.retries, 1)
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_retries_server_errors_with_backoff(self):
+        failures = [(503, {}, {}), (500, {}, {}), (502, {}, {})]
+        with StubCoinGeckoServer({"/api/v3/ping": failing_then_ok(failures, {"ok": True})}) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10, backoff=0.01)
+            response = client.get(f"{server.base_url}ping")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.requests), 4)
+
+    def test_gives_up_after_max_retries(self):
+        with StubCoinGeckoServer({"/api/v3/ping": (429, {}, {})}) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10, max_retries=2, backoff=0.01)
+            response = client.get(f"{server.base_url}ping")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_times_out_slow_responses(self):
+        with StubCoinGeckoServer({"/api/v3/ping": {"ok": True}}, delay=0.5) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10, max_retries=1, backoff=0.01, timeout=0.1)
+            with self.assertRaises(requests.Timeout):
+                client.get(f"{server.base_url}ping")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_identical_in_flight_requests_are_coalesced(self):
+        with StubCoinGeckoServer({"/api/v3/ping": {"ok": True}}, delay=0.2) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10)
+            responses = []
+            threads = [
+                threading.Thread(target=lambda: responses.append(client.get(f"{server.base_url}ping", {"a": 1})))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual([r.json() for r in responses], [{"ok": True}] * 5)
+
+    def test_token_bucket_caps_the_rate(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+        started = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        # 5 calls go out as a burst, the other 10 at 50 per second
+        self.assertGreaterEqual(time.monotonic() - started, 10 / 50 * 0.9)
+
+    def test_batch_fetch_survives_rate_limiting(self):
+        coins = [f"coin-{i}" for i in range(6)]
+        routes = {
+            f"/api/v3/coins/{coin}/market_chart": failing_then_ok(
+                [(429, {"Retry-After": "0"}, {})], market_chart_payload()
+            )
+            for coin in coins
+        }
+        with StubCoinGeckoServer(routes) as server:
+            client = CoinGeckoClient(calls_per_minute=60000, burst=10, backoff=0.01)
+            histories = get_historical_data_batch(coins, session=client, base_url=server.base_url)
+        self.assertTrue(all(not prices_df.empty for prices_df, _ in histories.values()))
+        self.assertEqual(client.retries, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from correlation import align_frames, correlation_matrix, rolling_correlation
+
+
+def make_frames(n_coins, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2023-01-01", periods=n_days, freq="D")
+    return {
+        f"coin-{i}": pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "price": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))),
+                "volume": rng.uniform(1, 2, n_days),
+            }
+        )
+        for i in range(n_coins)
+    }
+
+
+class TestCorrelation(unittest.TestCase):
+    def test_aligns_on_timestamp_not_position(self):
+        frames = make_frames(2, 10)
+        # Drop the first days of one coin; positional alignment would pair
+        # up the wrong days.
+        frames["coin-1"] = frames["coin-1"].iloc[3:].reset_index(drop=True)
+        result = correlation_matrix(frames)
+        wide = align_frames(frames)
+        expected = wide["coin-0"].corr(wide["coin-1"])
+        self.assertAlmostEqual(result.loc["coin-0", "coin-1"], expected)
+
+    def test_matches_pandas_with_gaps(self):
+        frames = make_frames(20, 60)
+        frames["coin-3"].loc[[5, 17], "price"] = np.nan
+        frames["coin-7"] = frames["coin-7"].iloc[10:]
+        wide = align_frames(frames)
+        for on, series in (("price", wide), ("log_returns", np.log(wide).diff().iloc[1:])):
+            for method in ("pearson", "spearman"):
+                result = correlation_matrix(frames, method=method, on=on)
+                expected = series.rank().corr() if method == "spearman" else series.corr()
+                np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-10)
+
+    def test_rolling_correlation_against_reference(self):
+        frames = make_frames(3, 40)
+        result = rolling_correlation(frames, "coin-0", window=10)
+        self.assertEqual(list(result.columns), ["coin-0", "coin-1", "coin-2"])
+        self.assertTrue(np.allclose(result["coin-0"].dropna(), 1.0))
+
+    def test_rejects_unknown_method(self):
+        with self.assertRaises(ValueError):
+            correlation_matrix(make_frames(2, 5), method="kendall")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from currency import get_multi_currency_frames
+from market_cache import MarketChartCache
+from scrapping_the_data_and_performing_calculations import clean_data
+from stub_coingecko_server import StubCoinGeckoServer, fast_client, market_chart_payload
+
+# Units of each currency per USD
+usd_rates = {"usd": 1.0, "eur": 0.9, "gbp": 0.8}
+# Recent enough for the cached 30-day window to keep every point
+start_ms = (int(time.time()) // 3600 - 48) * 3600 * 1000
+
+
+def chart_route(base_price, missing=()):
+    def route(query):
+        currency = query["vs_currency"]
+        if currency in missing or currency not in usd_rates:
+            return None
+        payload = market_chart_payload(48, start_ms=start_ms, base_price=base_price)
+        for key in ("prices", "market_caps", "total_volumes"):
+            payload[key] = [[t, value * usd_rates[currency]] for t, value in payload[key]]
+        return payload
+
+    return route
+
+
+class TestMultiCurrencyFrames(unittest.TestCase):
+    def serve(self, missing=()):
+        return StubCoinGeckoServer({
+            "/api/v3/coins/bitcoin/market_chart": chart_route(1000.0, missing),
+            "/api/v3/coins/ethereum/market_chart": chart_route(100.0),
+            "/api/v3/coins/solana/market_chart": chart_route(10.0),
+        })
+
+    def test_one_usd_fetch_per_coin_plus_one_reference_per_currency(self):
+        coins = ["ethereum", "solana"]
+        with self.serve() as server:
+            frames = get_multi_currency_frames(coins, ["usd", "eur", "gbp", "btc"], session=fast_client(),
+                                               base_url=server.base_url)
+        # 2 coins and bitcoin in USD, bitcoin in EUR and GBP: 5 calls rather than 8
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(sorted(frames), ["btc", "eur", "gbp", "usd"])
+        usd = frames["usd"]["ethereum"]
+        self.assertEqual(list(usd.columns), ["timestamp", "price", "volume", "market_cap"])
+        for currency in ("eur", "gbp"):
+            converted = frames[currency]["ethereum"]
+            for column in ("price", "volume", "market_cap"):
+                np.testing.assert_allclose(converted[column], usd[column] * usd_rates[currency])
+        bitcoin = np.array(market_chart_payload(48, start_ms=start_ms, base_price=1000.0)["prices"])[:, 1]
+        np.testing.assert_allclose(frames["btc"]["solana"]["price"], frames["usd"]["solana"]["price"] / bitcoin)
+        self.assertNotIn("bitcoin", frames["usd"])
+
+    def test_falls_back_to_direct_fetches_without_a_reference(self):
+        with self.serve(missing=("gbp",)) as server:
+            frames = get_multi_currency_frames(["ethereum"], ["usd", "gbp"], session=fast_client(),
+                                               base_url=server.base_url)
+        self.assertIn(("/api/v3/coins/ethereum/market_chart", {"vs_currency": "gbp", "days": "30"}), server.requests)
+        np.testing.assert_allclose(frames["gbp"]["ethereum"]["price"], frames["usd"]["ethereum"]["price"] * 0.8)
+
+    def test_cached_references_need_no_calls(self):
+        with tempfile.TemporaryDirectory() as directory, self.serve() as server:
+            cache = MarketChartCache(os.path.join(directory, "cache.sqlite"))
+            first = get_multi_currency_frames(["ethereum"], ["eur"], session=fast_client(), base_url=server.base_url,
+                                              cache=cache)
+            calls = len(server.requests)
+            second = get_multi_currency_frames(["ethereum"], ["eur"], session=fast_client(), base_url=server.base_url,
+                                               cache=cache)
+            cache.close()
+        self.assertEqual(calls, 3)
+        self.assertEqual(len(server.requests), calls)
+        np.testing.assert_allclose(second["eur"]["ethereum"]["market_cap"], first["eur"]["ethereum"]["market_cap"])
+
+    def test_clean_data_keeps_market_caps(self):
+        with self.serve() as server:
+            frames = get_multi_currency_frames(["ethereum"], ["eur"], session=fast_client(), base_url=server.base_url)
+        df = clean_data(frames["eur"]["ethereum"])
+        self.assertEqual(list(df.columns), ["timestamp", "price", "volume", "market_cap"])
+        self.assertLessEqual(len(df), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
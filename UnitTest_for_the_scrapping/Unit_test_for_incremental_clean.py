@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from incremental_clean import IncrementalCleaner
+from scrapping_the_data_and_performing_calculations import clean_data
+
+
+def make_ticks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = 1677628800000
+    timestamps = np.sort(start + rng.integers(0, 9 * 24 * 3600 * 1000, n))
+    # Leave one whole day without data so the cleaner has to fill the gap
+    timestamps = timestamps[(timestamps - start) // 86400000 != 4]
+    timestamps = pd.to_datetime(np.unique(timestamps), unit="ms")
+    prices_df = pd.DataFrame({"timestamp": timestamps, "price": rng.normal(100, 5, timestamps.size)})
+    volume_df = pd.DataFrame({"timestamp": timestamps, "volume": rng.uniform(1, 2, timestamps.size)})
+    return prices_df, volume_df
+
+
+class TestIncrementalCleaner(unittest.TestCase):
+    def test_matches_clean_data_after_chunked_updates(self):
+        prices_df, volume_df = make_ticks(2000)
+        cleaner = IncrementalCleaner()
+        for start, stop in ((0, 10), (10, 700), (700, 701), (701, None)):
+            cleaner.update_frames(prices_df.iloc[start:stop], volume_df.iloc[start:stop])
+            expected = clean_data(prices_df.iloc[:stop], volume_df.iloc[:stop])
+            assert_frame_equal(cleaner.frame(), expected)
+
+    def test_resent_rows_are_ignored(self):
+        prices_df, volume_df = make_ticks(300)
+        cleaner = IncrementalCleaner.from_frames(prices_df, volume_df)
+        cleaner.update_frames(prices_df.iloc[-50:], volume_df.iloc[-50:])
+        assert_frame_equal(cleaner.frame(), clean_data(prices_df, volume_df))
+
+    def test_update_only_touches_new_days(self):
+        prices_df, volume_df = make_ticks(300)
+        cleaner = IncrementalCleaner.from_frames(prices_df.iloc[:-1], volume_df.iloc[:-1])
+        before = {day: row.copy() for day, row in cleaner.buckets.items()}
+        cleaner.update(prices_df["timestamp"].iloc[-1:], prices_df["price"].iloc[-1:], volume_df["volume"].iloc[-1:])
+        changed = [day for day, row in cleaner.buckets.items() if day not in before or not np.array_equal(row, before[day])]
+        self.assertEqual(len(changed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
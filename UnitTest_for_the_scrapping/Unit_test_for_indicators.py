@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from indicators import IndicatorEngine, rolling_sum
+
+
+def make_frames(n_coins, n_days=200, seed=0):
+    # clean_data-shaped daily frames
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2022-01-01", periods=n_days, freq="D")
+    return {
+        f"coin-{i}": pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "price": 100 * (i + 1) * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))),
+                "volume": rng.lognormal(20, 1, n_days),
+            }
+        )
+        for i in range(n_coins)
+    }
+
+
+def wide(frames, column):
+    return pd.DataFrame({coin: df.set_index("timestamp")[column] for coin, df in frames.items()})
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    def setUp(self):
+        self.frames = make_frames(4)
+        # A gap in one coin must not leak into the others
+        self.frames["coin-1"].loc[40:45, "price"] = np.nan
+        self.prices = wide(self.frames, "price")
+        self.volumes = wide(self.frames, "volume")
+        self.engine = IndicatorEngine()
+        self.result = self.engine.compute(self.frames)
+
+    def assert_matches(self, name, expected):
+        np.testing.assert_allclose(self.result[name].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_batch_matches_pandas(self):
+        prices, volumes = self.prices, self.volumes
+        log_returns = np.log(prices).diff()
+        self.assert_matches("log_return", log_returns)
+        self.assert_matches("return", prices.pct_change(fill_method=None))
+        self.assert_matches("sma_7", prices.rolling(7).mean())
+        self.assert_matches("sma_30", prices.rolling(30).mean())
+        self.assert_matches("ema_12", prices.ewm(span=12, adjust=False, ignore_na=True).mean())
+        self.assert_matches("volatility_30", log_returns.rolling(30).std())
+        self.assert_matches("vwap_30", (prices * volumes).rolling(30).sum() / volumes.where(prices.notna()).rolling(30).sum())
+        self.assert_matches("drawdown", prices / prices.cummax() - 1)
+
+    def test_incremental_updates_match_the_batch(self):
+        engine = IndicatorEngine()
+        parts = [engine.compute({coin: df.iloc[:50] for coin, df in self.frames.items()})]
+        for start in range(50, 200, 17):
+            # Each update resends a few old bars, which must be ignored
+            parts.append(engine.update({coin: df.iloc[max(start - 3, 0):start + 17] for coin, df in self.frames.items()}))
+        for name, expected in self.result.items():
+            combined = pd.concat([part[name] for part in parts])
+            np.testing.assert_allclose(combined.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=name)
+        pd.testing.assert_frame_equal(engine.summary(), self.engine.summary(), rtol=1e-9)
+        self.assertEqual(engine.update(self.frames), {})
+
+    def test_summary(self):
+        summary = self.engine.summary()
+        self.assertEqual(list(summary.index), list(self.frames))
+        prices = self.prices["coin-0"]
+        self.assertAlmostEqual(summary.loc["coin-0", "price"], prices.iloc[-1])
+        self.assertAlmostEqual(summary.loc["coin-0", "total_return"], prices.iloc[-1] / prices.iloc[0] - 1)
+        self.assertAlmostEqual(summary.loc["coin-0", "max_drawdown"], (prices / prices.cummax() - 1).min())
+        self.assertAlmostEqual(summary.loc["coin-0", "sma_7"], prices.iloc[-7:].mean())
+
+    def test_rolling_sum_needs_full_windows(self):
+        values = np.array([[1.0], [2.0], [np.nan], [4.0], [5.0], [6.0]])
+        np.testing.assert_array_equal(rolling_sum(values, 2)[:, 0], [np.nan, 3, np.nan, np.nan, 9, 11])
+        self.assertTrue(np.isnan(rolling_sum(values[:1], 2)).all())
+
+    def test_scales_to_many_series(self):
+        frames = make_frames(1000, n_days=365)
+        result = IndicatorEngine().compute(frames)
+        self.assertEqual(result["sma_30"].shape, (365, 1000))
+        self.assertFalse(result["sma_30"].iloc[29:].isna().any().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
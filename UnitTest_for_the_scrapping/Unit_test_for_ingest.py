@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from ingest import align_points, decode_market_chart, market_chart_frame, parse_market_chart_body, split_frame
+from scrapping_the_data_and_performing_calculations import clean_data
+from stub_coingecko_server import market_chart_payload
+
+
+def parse_market_chart(data):
+    # The pandas parsing the fast path replaced, kept as the reference
+    prices_df = pd.DataFrame(data["prices"], columns=["timestamp", "price"])
+    prices_df["timestamp"] = pd.to_datetime(prices_df["timestamp"], unit="ms")
+    volume_df = pd.DataFrame(data["total_volumes"], columns=["timestamp", "volume"])
+    volume_df["timestamp"] = pd.to_datetime(volume_df["timestamp"], unit="ms")
+    return prices_df, volume_df
+
+
+def random_payload(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1647100800000 + np.arange(n_points) * 3600000
+    return {
+        key: [[int(t), float(v)] for t, v in zip(timestamps, rng.lognormal(scale, 1, n_points))]
+        for key, scale in (("prices", 10), ("market_caps", 25), ("total_volumes", 20))
+    }
+
+
+class TestDecodeMarketChart(unittest.TestCase):
+    def test_matches_the_json_parser_exactly(self):
+        payload = random_payload(1000)
+        arrays = decode_market_chart(json.dumps(payload).encode("utf-8"))
+        for key, points in payload.items():
+            np.testing.assert_array_equal(arrays[key], np.array(points, dtype=float))
+
+    def test_tolerates_whitespace_and_empty_series(self):
+        body = b'{ "prices" : [ [1, 2.5], [2, 3e2] ], "market_caps": [ ], "total_volumes": [[1, 4], [2, 5]] }'
+        arrays = decode_market_chart(body)
+        np.testing.assert_array_equal(arrays["prices"], [[1, 2.5], [2, 300]])
+        self.assertEqual(arrays["market_caps"].shape, (0, 2))
+
+    def test_null_values_fall_back_to_json_and_are_dropped(self):
+        body = b'{"prices": [[1, 2], [2, null], [3, 4]], "market_caps": [[1, 5]], "total_volumes": [[1, 6], [3, 7]]}'
+        arrays = decode_market_chart(body)
+        np.testing.assert_array_equal(arrays["prices"], [[1, 2], [3, 4]])
+        np.testing.assert_array_equal(arrays["total_volumes"], [[1, 6], [3, 7]])
+
+    def test_uses_less_memory_than_the_json_parser(self):
+        body = json.dumps(random_payload(50_000)).encode("utf-8")
+
+        def peak(fn):
+            tracemalloc.start()
+            try:
+                fn()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        fast = peak(lambda: decode_market_chart(body))
+        slow = peak(lambda: {key: np.asarray(value) for key, value in json.loads(body).items()})
+        self.assertLess(fast * 2, slow)
+
+
+class TestMarketChartFrame(unittest.TestCase):
+    def test_shared_timestamps_give_one_aligned_frame(self):
+        payload = market_chart_payload(n_points=5)
+        df = parse_market_chart_body(json.dumps(payload))
+        self.assertEqual(list(df.columns), ["timestamp", "price", "volume", "market_cap"])
+        self.assertEqual(df["timestamp"].dtype, np.dtype("datetime64[ms]"))
+        self.assertEqual(df["market_cap"].tolist(), [p * 1000 for _, p in payload["prices"]])
+        prices_df, volume_df = split_frame(df)
+        expected_prices, expected_volume = parse_market_chart(payload)
+        np.testing.assert_array_equal(prices_df["timestamp"].to_numpy(), expected_prices["timestamp"].to_numpy())
+        np.testing.assert_array_equal(prices_df["price"].to_numpy(), expected_prices["price"].to_numpy())
+        np.testing.assert_array_equal(volume_df["volume"].to_numpy(), expected_volume["volume"].to_numpy())
+
+    def test_different_timestamps_are_merged(self):
+        arrays = {
+            "prices": np.array([[1000.0, 1], [2000, 2], [3000, 3]]),
+            "total_volumes": np.array([[2000.0, 20], [3000, 30]]),
+            "market_caps": np.array([[3000.0, 300]]),
+        }
+        df = market_chart_frame(arrays)
+        self.assertEqual(df["price"].tolist(), [2, 3])
+        self.assertEqual(df["volume"].tolist(), [20, 30])
+        self.assertTrue(np.isnan(df["market_cap"].iloc[0]))
+        self.assertEqual(df["market_cap"].iloc[1], 300)
+
+
+class TestCleanData(unittest.TestCase):
+    def test_clean_data_without_the_merge_matches_the_merge(self):
+        prices_df, volume_df = split_frame(parse_market_chart_body(json.dumps(random_payload(24 * 10))))
+        expected = pd.merge(prices_df, volume_df, on="timestamp")
+        expected = expected.set_index("timestamp").resample("D").mean().reset_index()
+        pd.testing.assert_frame_equal(clean_data(prices_df, volume_df), expected)
+        # Frames that do not share timestamps still go through the merge
+        aligned = align_points(prices_df.iloc[1:], volume_df.iloc[:-1])
+        self.assertEqual(len(aligned), len(prices_df) - 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from live_poller import LivePoller, LiveStats
+from stub_coingecko_server import StubCoinGeckoServer, fast_client
+
+
+def price_route(seed=0, missing_every=None):
+    # Random-walk prices for whichever ids are asked for
+    rng = np.random.default_rng(seed)
+    lock = threading.Lock()
+    state = {"tick": 0, "prices": {}}
+
+    def route(query):
+        with lock:
+            state["tick"] += 1
+            body = {}
+            for i, coin in enumerate(query["ids"].split(",")):
+                price = state["prices"].get(coin, 100.0 * (i + 1)) * np.exp(rng.normal(0, 0.01))
+                state["prices"][coin] = price
+                if missing_every and coin == "coin-0" and state["tick"] % missing_every == 0:
+                    continue
+                body[coin] = {query["vs_currencies"]: price}
+            return body
+
+    return route
+
+
+class TestLivePoller(unittest.TestCase):
+    def make_poller(self, server, coins):
+        return LivePoller(coins, client=fast_client(), interval=0, base_url=server.base_url)
+
+    def test_one_batched_request_per_tick(self):
+        coins = [f"coin-{i}" for i in range(300)]
+        with StubCoinGeckoServer({"/api/v3/simple/price": price_route()}) as server:
+            poller = self.make_poller(server, coins)
+            poller.run(max_ticks=5)
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.requests[0][1]["ids"], ",".join(coins))
+        timestamps, prices = poller.series()
+        self.assertEqual(prices.shape, (5, 300))
+        self.assertFalse(np.isnan(prices).any())
+        metrics = poller.metrics()
+        self.assertEqual(metrics["ticks"], 5)
+        self.assertEqual(metrics["points"], 1500)
+        self.assertGreater(metrics["points_per_second"], 0)
+
+    def test_running_stats_match_a_full_recompute(self):
+        coins = ["coin-0", "coin-1", "coin-2"]
+        with StubCoinGeckoServer({"/api/v3/simple/price": price_route(missing_every=4)}) as server:
+            poller = self.make_poller(server, coins)
+            poller.run(max_ticks=40)
+        _, prices = poller.series()
+        stats = poller.stats
+        np.testing.assert_allclose(stats.mean, np.nanmean(prices, axis=0))
+        np.testing.assert_allclose(stats.std_dev(), np.nanstd(prices, axis=0, ddof=1))
+        np.testing.assert_allclose(stats.min, np.nanmin(prices, axis=0))
+        np.testing.assert_allclose(stats.max, np.nanmax(prices, axis=0))
+        self.assertEqual(stats.count[0], 30)
+        # Correlation runs on prices with gaps carried forward
+        filled = prices.copy()
+        for t in range(1, len(filled)):
+            filled[t] = np.where(np.isnan(filled[t]), filled[t - 1], filled[t])
+        np.testing.assert_allclose(stats.correlation(), np.corrcoef(filled.T), atol=1e-9)
+
+    def test_unquoted_coin_does_not_block_correlation(self):
+        rng = np.random.default_rng(0)
+        prices = 100 + np.cumsum(rng.normal(size=(50, 3)), axis=0)
+        prices[:7, 1] = np.nan
+        prices[:, 2] = np.nan
+        stats = LiveStats(["a", "b", "never-quoted"])
+        for row in prices:
+            stats.update(row)
+        correlation = stats.correlation()
+        # a and b pair up from the first tick where both were seen
+        np.testing.assert_allclose(correlation[:2, :2], np.corrcoef(prices[7:, :2].T), atol=1e-9)
+        self.assertTrue(np.isnan(correlation[2]).all())
+        self.assertEqual(stats.pair_count[0, 1], 43)
+
+    def test_on_tick_runs_after_every_poll(self):
+        with StubCoinGeckoServer({"/api/v3/simple/price": price_route()}) as server:
+            poller = self.make_poller(server, ["coin-0", "coin-1"])
+            seen = []
+            poller.run(max_ticks=3, on_tick=lambda p: seen.append(len(p.series()[0])))
+        self.assertEqual(seen, [1, 2, 3])
+
+    def test_failed_ticks_are_counted(self):
+        with StubCoinGeckoServer({}) as server:
+            poller = LivePoller(["bitcoin"], client=fast_client(), interval=0, base_url=server.base_url)
+            poller.run(max_ticks=2)
+        self.assertEqual(poller.metrics()["failed_ticks"], 2)
+        self.assertEqual(poller.series()[1].shape, (0, 1))
+
+    def test_live_stats_summary(self):
+        stats = LiveStats(["a", "b"])
+        for row in ([1.0, 10.0], [3.0, 30.0], [2.0, np.nan]):
+            stats.update(np.array(row))
+        summary = stats.summary("a")
+        self.assertEqual(summary["avg_price"], 2.0)
+        self.assertEqual(summary["current_price"], 2.0)
+        self.assertEqual(stats.summary("b")["max_price"], 30.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from coingecko_client import make_session
+from fetcher import get_historical_data_batch, fetch_market_chart
+from ingest import decode_market_chart
+from market_cache import MarketChartCache
+from stub_coingecko_server import StubCoinGeckoServer, market_chart_payload
+
+HOUR_MS = 3600 * 1000
+
+
+class TestMarketChartCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.start_ms = int(time.time() * 1000) - 10 * HOUR_MS
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_warm_cache_skips_the_network(self):
+        routes = {
+            "/api/v3/coins/bitcoin/market_chart": market_chart_payload(5, start_ms=self.start_ms)
+        }
+        cache = MarketChartCache(self.path)
+        with StubCoinGeckoServer(routes) as server:
+            session = make_session(1)
+            first = get_historical_data_batch(["bitcoin"], session=session, base_url=server.base_url, cache=cache)
+            second = get_historical_data_batch(["bitcoin"], session=session, base_url=server.base_url, cache=cache)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertTrue(first["bitcoin"][0].equals(second["bitcoin"][0]))
+        self.assertEqual(len(second["bitcoin"][1]), 5)
+        cache.close()
+
+    def test_stale_cache_fetches_only_newer_points(self):
+        routes = {
+            "/api/v3/coins/bitcoin/market_chart": market_chart_payload(5, start_ms=self.start_ms),
+            "/api/v3/coins/bitcoin/market_chart/range": market_chart_payload(
+                3, start_ms=self.start_ms + 5 * HOUR_MS, base_price=105
+            ),
+        }
+        cache = MarketChartCache(self.path, refresh_interval=0)
+        with StubCoinGeckoServer(routes) as server:
+            session = make_session(1)
+            fetch_market_chart(session, "bitcoin", server.base_url, cache=cache)
+            prices_df, volume_df = fetch_market_chart(session, "bitcoin", server.base_url, cache=cache)
+        path, query = server.requests[1]
+        self.assertEqual(path, "/api/v3/coins/bitcoin/market_chart/range")
+        self.assertEqual(int(query["from"]), (self.start_ms + 4 * HOUR_MS) // 1000 + 1)
+        self.assertEqual(len(prices_df), 8)
+        self.assertEqual(list(prices_df["price"]), [100, 101, 102, 103, 104, 105, 106, 107])
+        self.assertTrue(prices_df["timestamp"].is_monotonic_increasing)
+        cache.close()
+
+    def test_longer_window_refetches_the_older_part(self):
+        now_ms = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+
+        def chart(query):
+            hours = int(query["days"]) * 24
+            return market_chart_payload(hours, start_ms=now_ms - (hours - 1) * HOUR_MS)
+
+        cache = MarketChartCache(self.path)
+        with StubCoinGeckoServer({"/api/v3/coins/bitcoin/market_chart": chart}) as server:
+            session = make_session(1)
+            uncached, _ = fetch_market_chart(session, "bitcoin", server.base_url, days=30)
+            cached, _ = fetch_market_chart(session, "bitcoin", server.base_url, days=30, cache=cache)
+            prices_df, _ = fetch_market_chart(session, "bitcoin", server.base_url, days=90, cache=cache)
+            again, _ = fetch_market_chart(session, "bitcoin", server.base_url, days=30, cache=cache)
+        self.assertEqual(len(cached), len(uncached))
+        self.assertEqual([query["days"] for _, query in server.requests], ["30", "30", "90"])
+        self.assertEqual(len(prices_df), 90 * 24)
+        self.assertEqual(len(again), 30 * 24)
+        self.assertEqual(cache.coverage("bitcoin")[1], HOUR_MS)
+        cache.close()
+
+    def test_refresh_is_thinned_to_the_cached_spacing(self):
+        five_minutes = 5 * 60 * 1000
+        last_ms = self.start_ms + 4 * HOUR_MS
+        routes = {
+            "/api/v3/coins/bitcoin/market_chart": market_chart_payload(5, start_ms=self.start_ms),
+            # A short range comes back in 5-minute points
+            "/api/v3/coins/bitcoin/market_chart/range": market_chart_payload(
+                30, start_ms=last_ms + five_minutes, step_ms=five_minutes, base_price=105
+            ),
+        }
+        cache = MarketChartCache(self.path, refresh_interval=0)
+        with StubCoinGeckoServer(routes) as server:
+            session = make_session(1)
+            fetch_market_chart(session, "bitcoin", server.base_url, cache=cache)
+            prices_df, _ = fetch_market_chart(session, "bitcoin", server.base_url, cache=cache)
+        gaps = prices_df["timestamp"].diff().dropna().dt.total_seconds()
+        self.assertEqual(len(prices_df), 7)
+        self.assertTrue((gaps >= 0.9 * 3600).all())
+        cache.close()
+
+    def test_full_fetch_after_a_gap_resets_coverage(self):
+        day_ms = 24 * HOUR_MS
+        now_ms = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+        cache = MarketChartCache(self.path)
+        cache.store("bitcoin", market_chart_payload(30 * 24, start_ms=now_ms - 70 * day_ms), since_ms=now_ms - 70 * day_ms)
+        cache.store("bitcoin", market_chart_payload(30 * 24, start_ms=now_ms - 30 * day_ms), since_ms=now_ms - 30 * day_ms)
+        self.assertEqual(cache.coverage("bitcoin")[0], now_ms - 30 * day_ms)
+        df = cache.load_frame("bitcoin", now_ms - 60 * day_ms)
+        self.assertEqual(len(df), 30 * 24)
+        self.assertEqual(df["timestamp"].diff().max(), pd.Timedelta(hours=1))
+        cache.close()
+
+    def test_stores_decoded_arrays_like_json(self):
+        payload = market_chart_payload(5, start_ms=self.start_ms)
+        cache = MarketChartCache(self.path)
+        cache.store("bitcoin", payload)
+        cache.store("ethereum", decode_market_chart(json.dumps(payload)))
+        pd.testing.assert_frame_equal(cache.load_frame("bitcoin"), cache.load_frame("ethereum"))
+        cache.close()
+
+    def test_size_and_ttl_eviction(self):
+        payload = market_chart_payload(5, start_ms=self.start_ms)
+        # Room for two coins' prices, volumes and market caps
+        cache = MarketChartCache(self.path, max_points=30)
+        cache.store("bitcoin", payload)
+        cache.store("ethereum", payload)
+        cache.load("bitcoin")
+        cache.store("solana", payload)
+        self.assertIsNone(cache.last_timestamp("ethereum"))
+        self.assertIsNotNone(cache.last_timestamp("bitcoin"))
+        self.assertLessEqual(cache.stats()["points"], 30)
+        cache.ttl = -1
+        cache.evict()
+        self.assertEqual(cache.stats()["series"], 0)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
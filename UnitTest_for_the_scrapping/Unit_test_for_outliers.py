@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from outliers import detect_outliers, rolling_zscore_mask
+
+
+def make_frames(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i, n in enumerate(lengths):
+        price = 100 + np.cumsum(rng.normal(0, 0.1, n))
+        frames[f"coin-{i}"] = pd.DataFrame(
+            {"timestamp": pd.date_range("2023-03-01", periods=n, freq="min"), "price": price}
+        )
+    return frames
+
+
+class TestOutliers(unittest.TestCase):
+    def test_zscore_matches_a_naive_window_scan(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(0, 1, (300, 3))
+        values[[50, 120, 250], [0, 1, 2]] = 8
+        values[10, 1] = np.nan
+        window = 20
+        mask = rolling_zscore_mask(values, window)
+        expected = np.zeros_like(mask)
+        for t in range(window, len(values)):
+            past = values[t - window : t]
+            for j in range(values.shape[1]):
+                if np.isnan(past[:, j]).any() or np.isnan(values[t, j]):
+                    continue
+                z = abs(values[t, j] - past[:, j].mean()) / past[:, j].std(ddof=1)
+                expected[t, j] = z > 3.0
+        np.testing.assert_array_equal(mask, expected)
+
+    def test_every_method_finds_injected_spikes(self):
+        frames = make_frames([2000, 1500, 800])
+        spikes = {"coin-0": [500, 1600], "coin-1": [1000], "coin-2": [300]}
+        for coin, positions in spikes.items():
+            frames[coin].loc[positions, "price"] += 25
+        for method in ("zscore", "mad", "iqr"):
+            found = detect_outliers(frames, method=method, window=60)
+            self.assertEqual(list(found), list(frames))
+            for coin, positions in spikes.items():
+                self.assertEqual(found[coin].dtype, np.int64)
+                for position in positions:
+                    self.assertIn(position, found[coin], f"{method} missed {coin}[{position}]")
+                # Padding of the shorter coins must never be reported
+                self.assertTrue((found[coin] < len(frames[coin])).all())
+
+    def test_log_returns_keep_a_random_walk_quiet(self):
+        rng = np.random.default_rng(1)
+        frames = {
+            f"coin-{i}": pd.DataFrame({"price": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 720)))})
+            for i in range(20)
+        }
+        rate = {
+            on: sum(len(found) for found in detect_outliers(frames, on=on).values()) / (20 * 720)
+            for on in ("price", "log_returns")
+        }
+        self.assertLess(rate["log_returns"], 0.01)
+        self.assertGreater(rate["price"], 2 * rate["log_returns"])
+        frames["coin-0"].loc[400, "price"] *= 1.2
+        self.assertIn(400, detect_outliers(frames, on="log_returns")["coin-0"])
+        with self.assertRaises(ValueError):
+            detect_outliers(frames, on="volume")
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            detect_outliers(make_frames([10]), method="dbscan")
+
+
+if __name__ == "__main__":
+    unittest.main()
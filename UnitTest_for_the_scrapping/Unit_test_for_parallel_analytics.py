@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from multiprocessing import shared_memory
+from unittest import mock
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+import parallel_analytics
+import scrapping_the_data_and_performing_calculations as script
+from parallel_analytics import SharedTimeSeries, analyze_coins
+from profiler import profiler
+from scrapping_the_data_and_performing_calculations import clean_data, get_stats
+from stub_coingecko_server import make_histories
+from timeseries_store import TimeSeriesStore
+
+
+class TestParallelAnalytics(unittest.TestCase):
+    def check_against_serial(self, histories, summary, frames):
+        self.assertEqual(list(summary.index), list(frames))
+        for coin, (prices_df, volume_df) in histories.items():
+            expected_df = clean_data(prices_df, volume_df)
+            assert_frame_equal(frames[coin], expected_df, check_dtype=False)
+            expected = get_stats(expected_df)
+            row = summary.loc[coin]
+            self.assertEqual(row["points"], len(prices_df))
+            self.assertEqual(row["days"], len(expected_df))
+            self.assertEqual(row["outliers"], len(expected["outliers"]))
+            for key in ("avg_price", "std_dev_price", "min_price", "max_price", "avg_volume", "max_volume"):
+                self.assertAlmostEqual(row[key], expected[key], places=6)
+
+    def test_process_pool_matches_serial_clean_data_and_get_stats(self):
+        histories = make_histories([720] * 6)
+        with mock.patch.object(parallel_analytics, "min_parallel_coins", 0):
+            summary, frames = analyze_coins(histories, max_workers=2)
+        self.check_against_serial(histories, summary, frames)
+
+    def test_few_coins_are_analysed_in_process(self):
+        histories = make_histories([720] * 2)
+        with mock.patch.object(parallel_analytics, "ProcessPoolExecutor") as pool:
+            summary, frames = analyze_coins(histories, max_workers=4)
+        pool.assert_not_called()
+        self.check_against_serial(histories, summary, frames)
+
+    def test_coins_without_data_are_left_out(self):
+        histories = make_histories([720] * 2)
+        histories["missing"] = (pd.DataFrame(), pd.DataFrame())
+        summary, frames = analyze_coins(histories, max_workers=1)
+        self.assertNotIn("missing", summary.index)
+        self.assertNotIn("missing", frames)
+
+    def test_worker_stage_timings_reach_the_parent(self):
+        profiler.reset()
+        profiler.enable()
+        try:
+            analyze_coins(make_histories([720] * 20), max_workers=2)
+            stages = profiler.report()["stages"]
+        finally:
+            profiler.disable()
+            profiler.reset()
+        self.assertEqual(len(stages), 40)
+        self.assertEqual({entry["stage"] for entry in stages}, {"clean", "stats"})
+        self.assertTrue(all(entry["calls"] == 1 for entry in stages))
+
+    def test_main_survives_failed_fetches(self):
+        # main() draws its charts with pyplot; only show() is mocked out
+        self.addCleanup(plt.close, "all")
+        fetched = dict(zip(["bitcoin", "ethereum"], make_histories([720] * 2).values()))
+        for failed in (["ethereum"], ["bitcoin", "ethereum"]):
+            histories = dict(fetched, **{coin: (pd.DataFrame(), pd.DataFrame()) for coin in failed})
+            output = io.StringIO()
+            with mock.patch.object(script, "get_historical_data_batch", return_value=histories), mock.patch.object(
+                script, "fetch_simple_prices", return_value={}
+            ), mock.patch.object(script, "MarketChartCache") as cache, mock.patch.object(
+                script, "CoinGeckoClient"
+            ), mock.patch("matplotlib.pyplot.show"), redirect_stdout(output):
+                cache.return_value.stats.return_value = {"hits": 0, "misses": 0}
+                script.main()
+            self.assertIn("Could not retrieve data for ethereum", output.getvalue())
+            self.assertNotIn("Correlation coefficient", output.getvalue())
+
+    def test_shared_memory_is_released(self):
+        store = TimeSeriesStore.from_frames(make_histories([720] * 3))
+        with SharedTimeSeries(store) as shared:
+            name, shape, dtype = shared.spec["arrays"]["prices"]
+            block = shared_memory.SharedMemory(name=name)
+            np.testing.assert_array_equal(np.ndarray(shape, dtype=dtype, buffer=block.buf), store.prices)
+            block.close()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
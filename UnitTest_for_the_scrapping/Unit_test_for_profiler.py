@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from profiler import Profiler, compare_reports
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(enabled=True)
+
+    def tearDown(self):
+        self.profiler.disable()
+
+    def entry(self, stage, coin=""):
+        for entry in self.profiler.report()["stages"]:
+            if entry["stage"] == stage and entry["coin"] == coin:
+                return entry
+        self.fail(f"no entry for {stage}/{coin}")
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+        with profiler.stage("clean", "bitcoin"):
+            profiler.add_bytes(100)
+        self.assertEqual(profiler.report()["stages"], [])
+        # Every disabled stage is the same shared no-op context manager
+        self.assertIs(profiler.stage("a"), profiler.stage("b"))
+
+    def test_stages_are_totalled_per_stage_and_coin(self):
+        for _ in range(3):
+            with self.profiler.stage("fetch", "bitcoin"):
+                self.profiler.add_bytes(10)
+        with self.profiler.stage("fetch", "ethereum"):
+            sum(range(100000))
+        bitcoin = self.entry("fetch", "bitcoin")
+        self.assertEqual(bitcoin["calls"], 3)
+        self.assertEqual(bitcoin["bytes"], 30)
+        ethereum = self.entry("fetch", "ethereum")
+        self.assertGreater(ethereum["wall_seconds"], 0)
+        self.assertGreater(ethereum["cpu_seconds"], 0)
+
+    def test_peak_memory_and_nested_stages(self):
+        with self.profiler.stage("pipeline"):
+            with self.profiler.stage("clean", "bitcoin"):
+                self.profiler.add_bytes(5)
+                data = bytearray(4 * 1024 * 1024)
+                del data
+        clean = self.entry("clean", "bitcoin")
+        self.assertGreaterEqual(clean["peak_memory_bytes"], 4 * 1024 * 1024)
+        pipeline = self.entry("pipeline")
+        # The outer stage sees the inner stage's peak and bytes
+        self.assertGreaterEqual(pipeline["peak_memory_bytes"], clean["peak_memory_bytes"])
+        self.assertEqual(pipeline["bytes"], 5)
+
+    def test_threads_keep_their_own_stages(self):
+        def work(coin):
+            with self.profiler.stage("fetch", coin):
+                self.profiler.add_bytes(len(coin))
+
+        threads = [threading.Thread(target=work, args=(coin,)) for coin in ("bitcoin", "eth")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.entry("fetch", "bitcoin")["bytes"], 7)
+        self.assertEqual(self.entry("fetch", "eth")["bytes"], 3)
+
+    def test_json_and_prometheus_output(self):
+        with self.profiler.stage("upload"):
+            self.profiler.add_bytes(42)
+        report = json.loads(self.profiler.to_json())
+        self.assertEqual(report["stages"][0]["bytes"], 42)
+        text = self.profiler.to_prometheus()
+        self.assertIn("# TYPE crypto_pipeline_stage_wall_seconds counter", text)
+        self.assertIn('crypto_pipeline_stage_bytes{stage="upload",coin=""} 42', text)
+
+    def test_compare_reports_flags_slower_stages(self):
+        baseline = {"stages": [
+            {"stage": "clean", "coin": "bitcoin", "wall_seconds": 1.0},
+            {"stage": "stats", "coin": "bitcoin", "wall_seconds": 1.0},
+        ]}
+        current = {"stages": [
+            {"stage": "clean", "coin": "bitcoin", "wall_seconds": 1.1},
+            {"stage": "stats", "coin": "bitcoin", "wall_seconds": 2.0},
+            {"stage": "plot", "coin": "bitcoin", "wall_seconds": 9.0},
+        ]}
+        regressions = compare_reports(baseline, current)
+        self.assertEqual([(r["stage"], r["after"]) for r in regressions], [("stats", 2.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
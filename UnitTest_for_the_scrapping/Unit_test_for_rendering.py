@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+import matplotlib.pyplot as plt
+
+from profiler import profiler
+from rendering import decimate_minmax, render_charts, render_coin_chart
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def make_frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2023-03-01", periods=n, freq="min")
+    df = pd.DataFrame({"timestamp": timestamps, "price": 100 + np.cumsum(rng.normal(0, 1, n))})
+    volume_df = pd.DataFrame({"timestamp": timestamps, "volume": rng.uniform(1e9, 2e9, n)})
+    return df, volume_df
+
+
+class TestRendering(unittest.TestCase):
+    def test_decimation_keeps_extremes_and_order(self):
+        rng = np.random.default_rng(1)
+        y = rng.normal(0, 1, 100_003)
+        x = np.arange(y.size)
+        xd, yd = decimate_minmax(x, y, 1000)
+        self.assertLessEqual(yd.size, 2000)
+        self.assertEqual(yd.max(), y.max())
+        self.assertEqual(yd.min(), y.min())
+        self.assertTrue(np.all(np.diff(xd) > 0))
+        np.testing.assert_array_equal(yd, y[xd])
+
+    def test_short_series_are_left_alone(self):
+        x = np.arange(5)
+        y = np.array([1.0, np.nan, 3.0, 2.0, 5.0])
+        xd, yd = decimate_minmax(x, y, 1000)
+        np.testing.assert_array_equal(xd, [0, 2, 3, 4])
+        np.testing.assert_array_equal(yd, [1.0, 3.0, 2.0, 5.0])
+
+    def test_render_coin_chart_returns_png_without_pyplot_figures(self):
+        df, volume_df = make_frames(50_000)
+        png = render_coin_chart("bitcoin", df, volume_df)
+        self.assertTrue(png.startswith(PNG_SIGNATURE))
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_render_charts_in_parallel(self):
+        charts = {f"coin-{i}": make_frames(2_000, seed=i) for i in range(4)}
+        images = render_charts(charts, max_workers=2)
+        self.assertEqual(list(images), list(charts))
+        self.assertTrue(all(image.startswith(PNG_SIGNATURE) for image in images.values()))
+
+
+    def test_render_charts_times_each_coin(self):
+        charts = {f"coin-{i}": make_frames(2_000, seed=i) for i in range(3)}
+        profiler.reset()
+        profiler.enable()
+        try:
+            images = render_charts(charts, max_workers=2)
+            stages = profiler.report()["stages"]
+        finally:
+            profiler.disable()
+            profiler.reset()
+        self.assertTrue(all(image.startswith(PNG_SIGNATURE) for image in images.values()))
+        self.assertEqual([(entry["stage"], entry["coin"]) for entry in stages], [("plot", coin) for coin in charts])
+
+
+if __name__ == "__main__":
+    unittest.main()
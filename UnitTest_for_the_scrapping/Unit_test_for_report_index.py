@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from market_cache import MarketChartCache
+from report_index import ReportIndex
+from scrapping_the_data_and_performing_calculations import clean_data, get_stats
+from stub_coingecko_server import make_histories
+
+
+class TestReportIndex(unittest.TestCase):
+    def setUp(self):
+        self.histories = make_histories([60 * 24] * 4)
+        self.index = ReportIndex()
+        self.index.refresh(self.histories, max_workers=1)
+
+    def test_stats_match_get_stats_over_the_window(self):
+        prices_df, volume_df = self.histories["coin-2"]
+        df = clean_data(prices_df, volume_df).iloc[-7:]
+        expected = get_stats(df)
+        stats = self.index.stats("coin-2", "7D")
+        self.assertEqual(stats["days"], 7)
+        for key in ("avg_price", "std_dev_price", "min_price", "max_volume"):
+            self.assertAlmostEqual(stats[key], expected[key])
+        self.assertEqual(len(stats["outliers"]), len(expected["outliers"]))
+        self.assertEqual(self.index.stats("coin-2", "all")["days"], 60)
+        with self.assertRaises(ValueError):
+            self.index.stats("coin-2", "3D")
+
+    def test_queries_are_served_from_the_index(self):
+        with mock.patch.object(self.index, "get_stats") as stats, mock.patch(
+            "report_index.correlation_matrix"
+        ) as correlation:
+            started = time.perf_counter()
+            for _ in range(1000):
+                self.index.stats("coin-1", "30D")
+                self.index.top_correlated("coin-0", 2)
+            elapsed = time.perf_counter() - started
+        stats.assert_not_called()
+        correlation.assert_not_called()
+        self.assertLess(elapsed, 1.0)
+
+    def test_top_correlated(self):
+        top = self.index.top_correlated("coin-0", k=2)
+        self.assertEqual(len(top), 2)
+        self.assertEqual(top.index[0], "coin-1")
+        self.assertGreater(top.iloc[0], top.iloc[1])
+        self.assertNotIn("coin-0", top.index)
+        self.assertAlmostEqual(self.index.correlation("coin-0", "coin-1"), top.iloc[0])
+
+    def test_new_data_invalidates_only_what_it_touches(self):
+        before = self.index.stats("coin-0", "7D")
+        untouched = self.index.stats("coin-3", "7D")
+        extended = make_histories([61 * 24] * 4)
+        histories = dict(self.histories, **{"coin-0": extended["coin-0"]})
+        self.assertEqual(self.index.refresh(histories, precompute=False, max_workers=1), ["coin-0"])
+        self.assertNotIn(("coin-0", "7D"), self.index._stats)
+        self.assertIs(self.index.stats("coin-3", "7D"), untouched)
+        self.assertEqual(self.index._correlations, {})
+        after = self.index.stats("coin-0", "7D")
+        self.assertNotEqual(after["avg_price"], before["avg_price"])
+        # Nothing new, nothing to redo
+        self.assertEqual(self.index.refresh(histories, max_workers=1), [])
+
+    def test_refresh_runs_get_stats_once_per_coin_and_window(self):
+        stats = mock.Mock(side_effect=get_stats)
+        index = ReportIndex(stats=stats)
+        index.refresh(self.histories, max_workers=1)
+        self.assertEqual(stats.call_count, len(self.histories) * len(index.windows))
+
+    def test_refresh_from_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = MarketChartCache(os.path.join(directory, "cache.sqlite"))
+            now_ms = int(time.time() * 1000) // 3600000 * 3600000
+            for coin, (prices_df, volume_df) in make_histories([10 * 24] * 2, start_ms=now_ms - 10 * 86400000).items():
+                timestamps = prices_df["timestamp"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+                cache.store(coin, {
+                    "prices": list(zip(timestamps.tolist(), prices_df["price"])),
+                    "total_volumes": list(zip(timestamps.tolist(), volume_df["volume"])),
+                })
+            index = ReportIndex(windows={"7D": 7})
+            self.assertEqual(sorted(index.refresh_from_cache(cache, ["coin-0", "coin-1"], max_workers=1)), ["coin-0", "coin-1"])
+            cache.close()
+        self.assertEqual(list(index.summary("7D").index), ["coin-0", "coin-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from resampling import multi_resolution_bars, timeframe_volatility
+
+
+def make_ticks(n_days=40, step="5min", seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2023-03-01 00:03", periods=n_days * 288, freq=step)
+    prices_df = pd.DataFrame(
+        {"timestamp": timestamps, "price": 100 * np.exp(np.cumsum(rng.normal(0, 0.001, timestamps.size)))}
+    )
+    volume_df = pd.DataFrame({"timestamp": timestamps, "volume": rng.uniform(1, 2, timestamps.size)})
+    # Shuffle so the single sort has something to do
+    order = rng.permutation(timestamps.size)
+    return prices_df.iloc[order], volume_df.iloc[order]
+
+
+class TestMultiResolutionBars(unittest.TestCase):
+    def test_levels_match_direct_resampling(self):
+        prices_df, volume_df = make_ticks()
+        bars = multi_resolution_bars(prices_df, volume_df)
+        raw = pd.merge(prices_df, volume_df, on="timestamp").set_index("timestamp").sort_index()
+        rules = {"1h": "1h", "1D": "1D", "1W": "W-MON"}
+        for resolution, rule in rules.items():
+            resampled = raw.resample(rule, closed="left", label="left")
+            expected = resampled["price"].ohlc().dropna()
+            result = bars[resolution].set_index("timestamp")
+            np.testing.assert_array_equal(result.index, expected.index)
+            for column in ("open", "high", "low", "close"):
+                np.testing.assert_allclose(result[column], expected[column])
+            np.testing.assert_allclose(result["mean"], resampled["price"].mean().loc[expected.index])
+            np.testing.assert_allclose(result["volume"], resampled["volume"].sum().loc[expected.index])
+
+    def test_volatility_per_timeframe(self):
+        prices_df, volume_df = make_ticks()
+        bars = multi_resolution_bars(prices_df, volume_df)
+        volatility = timeframe_volatility(bars)
+        self.assertEqual(list(volatility), ["1h", "1D", "1W"])
+        # Longer bars accumulate more variance per bar
+        self.assertLess(volatility["1h"], volatility["1D"])
+        self.assertLess(volatility["1D"], volatility["1W"])
+
+    def test_rejects_resolutions_that_do_not_nest(self):
+        prices_df, volume_df = make_ticks(n_days=2)
+        with self.assertRaises(ValueError):
+            multi_resolution_bars(prices_df, volume_df, resolutions=("1D", "1h"))
+        with self.assertRaises(ValueError):
+            multi_resolution_bars(prices_df, volume_df, resolutions=("7h", "1D"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from rolling import column_centres, trailing_sums
+
+
+class TestRolling(unittest.TestCase):
+    def test_trailing_sums_match_a_naive_scan(self):
+        values = np.random.default_rng(0).normal(size=(50, 3))
+        for window, lag in ((1, 0), (7, 0), (7, 1), (60, 1)):
+            expected = np.array([values[max(t + 1 - lag - window, 0):max(t + 1 - lag, 0)].sum(axis=0) for t in range(50)])
+            np.testing.assert_allclose(trailing_sums(values, window, lag), expected, atol=1e-12)
+
+    def test_column_centres_skip_nans(self):
+        values = np.array([[1.0, np.nan], [3.0, np.nan]])
+        np.testing.assert_array_equal(column_centres(values), [2.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
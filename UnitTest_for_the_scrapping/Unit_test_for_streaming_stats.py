@@ -0,0 +1,86 @@
+import os
+import statistics
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from scrapping_the_data_and_performing_calculations import get_stats
+from streaming_stats import ColumnAccumulator, StatsAccumulator, stats_from_chunks
+
+
+class TestStreamingStats(unittest.TestCase):
+    def test_get_stats_keeps_its_keys_and_values(self):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(
+            {
+                "timestamp": pd.date_range("2023-03-01", periods=31, freq="D"),
+                "price": rng.normal(23000, 2000, 31),
+                "volume": rng.uniform(1e10, 7e10, 31),
+            }
+        )
+        df.loc[30, "price"] = 60000
+        stats = get_stats(df)
+        self.assertAlmostEqual(stats["avg_price"], df["price"].mean())
+        self.assertAlmostEqual(stats["std_dev_price"], statistics.stdev(df["price"]), places=6)
+        self.assertEqual(stats["min_price"], df["price"].min())
+        self.assertEqual(stats["max_price"], df["price"].max())
+        self.assertAlmostEqual(stats["avg_volume"], df["volume"].mean(), delta=1e-3)
+        self.assertAlmostEqual(stats["std_dev_volume"], statistics.stdev(df["volume"]), delta=1e-3)
+        self.assertEqual(stats["min_volume"], df["volume"].min())
+        self.assertEqual(stats["max_volume"], df["volume"].max())
+        q1, q3 = df["price"].quantile([0.25, 0.75])
+        iqr = q3 - q1
+        expected = df[(df["price"] < q1 - 1.5 * iqr) | (df["price"] > q3 + 1.5 * iqr)]
+        pd.testing.assert_frame_equal(stats["outliers"], expected)
+
+    def test_merged_chunks_match_a_single_pass(self):
+        rng = np.random.default_rng(2)
+        values = rng.lognormal(3, 1, 200_000)
+        whole = ColumnAccumulator().update(values)
+        merged = ColumnAccumulator()
+        for chunk in np.array_split(values, 7):
+            merged.merge(ColumnAccumulator().update(chunk))
+        self.assertEqual(merged.count, values.size)
+        self.assertAlmostEqual(merged.mean, values.mean())
+        self.assertAlmostEqual(merged.std_dev, values.std(ddof=1))
+        self.assertEqual(merged.min, values.min())
+        self.assertEqual(merged.max, values.max())
+        for accumulator in (whole, merged):
+            for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+                exact = np.quantile(values, q)
+                self.assertAlmostEqual(accumulator.quantile(q), exact, delta=0.02 * exact)
+
+    def test_digest_stays_bounded(self):
+        accumulator = ColumnAccumulator(compression=100)
+        for chunk in np.array_split(np.arange(1_000_000, dtype=float), 50):
+            accumulator.update(chunk)
+        self.assertLess(accumulator._means.size, 100)
+        self.assertAlmostEqual(accumulator.quantile(0.5), 500_000, delta=5_000)
+
+    def test_outlier_bounds_of_a_compressed_digest(self):
+        df = pd.DataFrame({"price": np.arange(1000.0), "volume": np.ones(1000)})
+        lower, upper = StatsAccumulator().update(df).outlier_bounds("price")
+        self.assertAlmostEqual(lower, 249.75 - 1.5 * 499.5, delta=10)
+        self.assertAlmostEqual(upper, 749.25 + 1.5 * 499.5, delta=10)
+
+    def test_stats_from_chunks(self):
+        df = pd.DataFrame({"price": np.arange(10.0), "volume": np.arange(10.0) * 2})
+        accumulator = stats_from_chunks([df.iloc[:3], df.iloc[3:7], df.iloc[7:]])
+        self.assertIsInstance(accumulator, StatsAccumulator)
+        summary = accumulator.summary()
+        self.assertEqual(summary["avg_price"], 4.5)
+        self.assertEqual(summary["max_volume"], 18.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
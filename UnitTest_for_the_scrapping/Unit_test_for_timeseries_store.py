@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "Scrapping_the_data_and_performing_calculations",
+    ),
+)
+from scrapping_the_data_and_performing_calculations import clean_data, get_stats
+from stub_coingecko_server import make_histories
+from timeseries_store import TimeSeriesStore
+
+
+def mean_price(directory, coin):
+    store = TimeSeriesStore.load(directory)
+    return float(store.arrays(coin)[1].mean())
+
+
+class TestTimeSeriesStore(unittest.TestCase):
+    def test_views_feed_the_pipeline_unchanged(self):
+        histories = make_histories([100, 250, 30])
+        store = TimeSeriesStore.from_frames(histories)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.timestamps.dtype, np.int64)
+        for coin, (prices_df, volume_df) in histories.items():
+            assert_frame_equal(store.prices_df(coin), prices_df)
+            assert_frame_equal(store.volume_df(coin), volume_df)
+            expected = clean_data(prices_df, volume_df)
+            cleaned = clean_data(store.prices_df(coin), store.volume_df(coin))
+            assert_frame_equal(cleaned, expected)
+            self.assertEqual(get_stats(cleaned)["avg_price"], get_stats(expected)["avg_price"])
+
+    def test_frames_do_not_copy(self):
+        store = TimeSeriesStore.from_frames(make_histories([50, 60]))
+        frame = store.frame("coin-1")
+        self.assertTrue(np.shares_memory(frame["price"].to_numpy(), store.prices))
+        self.assertTrue(np.shares_memory(frame["timestamp"].to_numpy(), store.timestamps))
+
+    def test_mismatched_timestamps_are_merged(self):
+        prices_df, volume_df = make_histories([10])["coin-0"]
+        store = TimeSeriesStore.from_frames({"coin-0": (prices_df, volume_df.iloc[2:])})
+        self.assertEqual(len(store.frame("coin-0")), 8)
+
+    def test_float32_storage(self):
+        store = TimeSeriesStore.from_frames(make_histories([10]), dtype=np.float32)
+        self.assertEqual(store.prices.dtype, np.float32)
+
+    def test_memory_mapped_store_is_shared_with_workers(self):
+        histories = make_histories([500, 400])
+        with tempfile.TemporaryDirectory() as directory:
+            TimeSeriesStore.from_frames(histories).save(directory)
+            loaded = TimeSeriesStore.load(directory)
+            self.assertIsInstance(loaded.prices, np.memmap)
+            assert_frame_equal(loaded.prices_df("coin-1"), histories["coin-1"][0])
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                means = list(executor.map(mean_price, [directory] * 2, ["coin-0", "coin-1"]))
+            del loaded
+        self.assertAlmostEqual(means[0], histories["coin-0"][0]["price"].mean())
+        self.assertAlmostEqual(means[1], histories["coin-1"][0]["price"].mean())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from coingecko_client import CoinGeckoClient
+
+
+def market_chart_payload(n_points=4, start_ms=1647100800000, step_ms=3600000, base_price=100.0):
+    timestamps = [start_ms + i * step_ms for i in range(n_points)]
+    return {
+        "prices": [[t, base_price + i] for i, t in enumerate(timestamps)],
+        "market_caps": [[t, (base_price + i) * 1000] for i, t in enumerate(timestamps)],
+        "total_volumes": [[t, 10.0 + i] for i, t in enumerate(timestamps)],
+    }
+
+
+def make_histories(lengths, seed=0, start_ms=1677628800000):
+    """Hourly (prices_df, volume_df) histories for coin-0, coin-1, ..., one
+    per entry of `lengths`. Every coin follows a shared random walk; coin-0
+    and coin-1 stay close to it while the rest drift apart."""
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 0.01, max(lengths, default=0)))
+    histories = {}
+    for i, n in enumerate(lengths):
+        timestamps = pd.to_datetime(start_ms + np.arange(n) * 3600000, unit="ms")
+        noise = 0.001 if i < 2 else 0.05
+        prices = 100 * (i + 1) * np.exp(common[:n] + np.cumsum(rng.normal(0, noise, n)))
+        histories[f"coin-{i}"] = (
+            pd.DataFrame({"timestamp": timestamps, "price": prices}),
+            pd.DataFrame({"timestamp": timestamps, "volume": rng.lognormal(20, 0.5, n)}),
+        )
+    return histories
+
+
+def fast_client(pool_size=8):
+    # No rate limit or retries to speak of, so the tests only measure the code under test
+    return CoinGeckoClient(calls_per_minute=60000, burst=100, pool_size=pool_size, max_retries=0)
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that time out on purpose drop their connection mid-response
+        pass
+
+
+class StubCoinGeckoServer:
+    """A local stand-in for the CoinGecko API, served from a background thread.
+
+    `routes` maps a URL path to a payload (or a callable taking the parsed
+    query and returning one). Every request is logged, and the number of
+    requests being served at the same moment is tracked in `max_in_flight`.
+    """
+
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = routes or {}
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _QuietServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v3/"
+
+    def _handle(self, handler):
+        parsed = urlparse(handler.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        with self._lock:
+            self.requests.append((parsed.path, query))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            route = self.routes.get(parsed.path)
+            if callable(route):
+                route = route(query)
+            if route is None:
+                status, headers, body = 404, {}, {"error": "not found"}
+            elif isinstance(route, tuple):
+                status, headers, body = route
+            else:
+                status, headers, body = 200, {}, route
+            encoded = json.dumps(body).encode("utf-8")
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(encoded)))
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(encoded)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()